@@ -10,7 +10,10 @@ from app.models.db import get_db
 from app.models.chat import Session as ChatSession, ChatLog
 from app.core.security import get_current_active_user
 from sqlalchemy.orm import Session
-from src.llm import process_query
+from src.llm import process_query, shutdown_summarizer
+from src.metrics import snapshot as metrics_snapshot
+from src.weather import start_weather_prefetcher, close_weather_client
+from src.fetch_pt_places import preload_area_code_index
 from datetime import datetime
 
 # Load environment variables from all possible locations
@@ -48,6 +51,18 @@ app.add_middleware(
     max_age=600
 )
 
+@app.on_event("startup")
+def start_background_jobs():
+    # 지역 코드 테이블은 요청 경로가 아니라 시작 시 한 번 읽음
+    preload_area_code_index()
+    # 매시 발표 직후 인기 지역 날씨 캐시 미리 채우기
+    start_weather_prefetcher()
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    close_weather_client()
+    shutdown_summarizer()
+
 # Router registration
 app.include_router(user_router, prefix="/api", tags=["users"])
 app.include_router(chat_router, prefix="/api", tags=["chat"])
@@ -65,6 +80,7 @@ async def chat(
     세션 ID가 제공되면 해당 세션에 메시지를 저장합니다.
     """
     # 세션 확인
+    session = None
     if request.session_id:
         session = db.query(ChatSession).filter(
             ChatSession.user_id == current_user.id,
@@ -74,8 +90,8 @@ async def chat(
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
     
-    # 챗봇 응답 생성 - 세션 ID 전달
-    response_text = process_query(request.query, request.session_id)
+    # 챗봇 응답 생성 - 세션 ID 전달 (ChatLog가 참조하는 sessions.id)
+    response_text = process_query(request.query, session.id if session else None)
     
     # 세션이 있으면 봇 메시지 저장
     if request.session_id:
@@ -94,6 +110,14 @@ async def chat(
         session_id=request.session_id
     )
 
+@app.get("/api/metrics", tags=["monitoring"])
+def read_metrics(current_user = Depends(get_current_active_user)):
+    """
+    날씨 API 지연 시간, 결과 코드, 캐시 적중률 등 서버 지표를 반환합니다.
+    다른 /api 경로와 같이 로그인한 사용자만 조회할 수 있습니다.
+    """
+    return metrics_snapshot()
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Pet Travel API"}
\ No newline at end of file
@@ -1 +1,11 @@
-from src import (vector_manger, fetch_pt_places, weather)
\ No newline at end of file
+import os
+import sys
+
+# src 안의 모듈은 서로를 최상위 이름(import weather 등)으로 import하므로 src를 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import vector_manger, fetch_pt_places, weather, metrics
+
+# src.weather와 weather가 같은 모듈 객체가 되도록 등록 (캐시·클라이언트·지표가 두 벌로 생기지 않게)
+for _module in (vector_manger, fetch_pt_places, weather, metrics):
+    sys.modules[f"{__name__}.{_module.__name__}"] = _module
@@ -308,7 +308,8 @@ if user_input:
 if st.session_state.pending_bot:
     try:
         with st.spinner(''):
-            bot_answer = process_query(st.session_state.pending_bot, stream=False)
+            # 인사말 검사는 위에서 이미 했으므로 생략
+            bot_answer = process_query(st.session_state.pending_bot, stream=False, skip_greeting=True)
             # 연속된 줄바꿈 제어
             bot_answer = re.sub(r'\n{3,}', '\n\n', bot_answer)  # 3개 이상 연속된 줄바꿈을 2개로 제한
             bot_answer = bot_answer.strip()  # 앞뒤 공백 제거
@@ -327,13 +328,6 @@ if st.session_state.pending_bot:
         st.session_state.pending_bot = None
         st.rerun()
 
-transport_keywords = {
-    "기차": ["기차", "ktx", "열차", "철도", "korail", "코레일"],
-    "버스": ["버스", "시내버스", "시외버스", "고속버스"],
-    "지하철": ["지하철", "전철", "metro"],
-    "택시": ["택시", "call", "콜택시"]
-}
-
 # ### 🚄 기차 이용 안내
 
 # #### KTX/일반열차 이용 규정
@@ -1,6 +1,9 @@
-from typing import Dict, List, Optional
+from itertools import compress
+from typing import Any, Dict, List, Optional, Sequence
 import logging
 from langchain.docstore.document import Document
+import metrics
+from keyword_matcher import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +15,22 @@ CATEGORY_TYPES = {
     "대중교통": ["버스터미널", "기차역", "버스정류장"]
 }
 
+# 카테고리별 장소 타입 매처 (대소문자 무시, 모듈 로드 시 한 번 컴파일)
+_TYPE_MATCHERS: Dict[str, KeywordMatcher] = {
+    category: KeywordMatcher(types) for category, types in CATEGORY_TYPES.items()
+}
+
+# 필터링 결과 집계 (장소별 로그 대신)
+_filter_results = metrics.counter('category_filter_places_total', '카테고리 타입 필터링 결과 (category, result별 장소 수)')
+
+
+def _place_document(place: Any) -> Optional[Document]:
+    """Document 또는 (Document, score) 검색 결과에서 Document를 꺼냄"""
+    if isinstance(place, tuple) and place:
+        place = place[0]
+    return place if isinstance(place, Document) else None
+
+
 class CategoryValidator:
     @staticmethod
     def validate_place_type(category: str, place_type: str) -> bool:
@@ -26,7 +45,7 @@ class CategoryValidator:
             bool: 유효한 타입이면 True, 아니면 False
         """
         if not place_type or not category:
-            logger.warning(f"Invalid input - category: {category}, place_type: {place_type}")
+            _filter_results.inc(category=category or "", result="no_type")
             return False
             
         if category not in CATEGORY_TYPES:
@@ -34,49 +53,73 @@ class CategoryValidator:
             return False
             
         # 대소문자 구분 없이 타입 검사
-        place_type_lower = place_type.lower()
-        valid_types = [t.lower() for t in CATEGORY_TYPES[category]]
-        
-        is_valid = any(t in place_type_lower for t in valid_types)
+        is_valid = _TYPE_MATCHERS[category].search(place_type)
         if not is_valid:
-            logger.warning(f"Type mismatch - category: {category}, place_type: {place_type}")
+            _filter_results.inc(category=category, result="type_mismatch")
             
         return is_valid
 
     @staticmethod
-    def filter_places_by_category(category: str, places: List[Document]) -> List[Document]:
+    def place_type_mask(category: str, places: Sequence[Any]) -> List[bool]:
         """
-        카테고리에 맞는 장소만 필터링
+        장소 목록 전체에 대한 카테고리 적합 여부 마스크
+        
+        같은 타입 문자열은 한 번만 검사하고, 결과는 장소별 로그 대신 카운터로 집계합니다.
         
         Args:
             category (str): 카테고리 이름
-            places (List[Document]): 장소 문서 리스트
+            places (Sequence[Any]): Document 또는 (Document, score) 검색 결과 리스트
             
         Returns:
-            List[Document]: 필터링된 장소 리스트
+            List[bool]: places와 같은 길이의 마스크 (itertools.compress 등으로 바로 적용)
         """
-        filtered_places = []
+        matcher = _TYPE_MATCHERS.get(category)
+        if matcher is None:
+            logger.warning(f"Unknown category: {category}")
+            _filter_results.inc(len(places), category=category, result="unknown_category")
+            return [False] * len(places)
+
+        verdicts: Dict[str, bool] = {}
+        counts = {"kept": 0, "type_mismatch": 0, "no_type": 0, "invalid": 0}
+        mask = []
         for place in places:
-            if not isinstance(place, Document):
-                logger.warning(f"Invalid place object: {place}")
-                continue
-                
-            metadata = place.metadata
-            if not metadata:
-                logger.warning(f"Place has no metadata: {place}")
+            doc = _place_document(place)
+            if doc is None or not doc.metadata:
+                counts["invalid"] += 1
+                mask.append(False)
                 continue
-                
-            place_type = metadata.get("type")
+            place_type = doc.metadata.get("type")
             if not place_type:
-                logger.warning(f"Place has no type: {metadata.get('title', 'Unknown')}")
+                counts["no_type"] += 1
+                mask.append(False)
                 continue
-                
-            if CategoryValidator.validate_place_type(category, place_type):
-                filtered_places.append(place)
-            else:
-                logger.info(f"Filtered out place {metadata.get('title', 'Unknown')} with type {place_type} from category {category}")
-                
-        return filtered_places
+            is_valid = verdicts.get(place_type)
+            if is_valid is None:
+                is_valid = verdicts[place_type] = matcher.search(place_type)
+            counts["kept" if is_valid else "type_mismatch"] += 1
+            mask.append(is_valid)
+
+        for result, count in counts.items():
+            if count:
+                _filter_results.inc(count, category=category, result=result)
+        if len(places) - counts["kept"]:
+            logger.debug(f"Category filter '{category}': kept {counts['kept']}/{len(places)} "
+                         f"(mismatch {counts['type_mismatch']}, no type {counts['no_type']}, invalid {counts['invalid']})")
+        return mask
+
+    @staticmethod
+    def filter_places_by_category(category: str, places: List[Document]) -> List[Document]:
+        """
+        카테고리에 맞는 장소만 필터링
+        
+        Args:
+            category (str): 카테고리 이름
+            places (List[Document]): 장소 문서 리스트
+            
+        Returns:
+            List[Document]: 필터링된 장소 리스트
+        """
+        return list(compress(places, CategoryValidator.place_type_mask(category, places)))
 
     @staticmethod
     def get_place_info(place: Document, map_link_func) -> Optional[Dict[str, str]]:
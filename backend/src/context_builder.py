@@ -0,0 +1,151 @@
+"""
+프롬프트 컨텍스트를 토큰 예산 안에 맞춰 조립합니다.
+
+검색 문서는 relevance_score가 높은 순서로 채우고, 문서 본문·대화 내역은 각각 상한 길이로
+잘라 넣습니다. 예산을 넘는 문서는 남은 만큼만 잘라 넣거나 제외합니다.
+"""
+import functools
+import logging
+import os
+from typing import Callable, Dict, List, Tuple
+
+from langchain.schema import Document
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# 토큰 예산 (환경 변수로 조정)
+PROMPT_CONTEXT_TOKEN_BUDGET = int(os.getenv('PROMPT_CONTEXT_TOKEN_BUDGET', '2500'))  # 검색 문서 전체
+PROMPT_HISTORY_TOKEN_BUDGET = int(os.getenv('PROMPT_HISTORY_TOKEN_BUDGET', '800'))   # 대화 내역 전체
+PROMPT_DOC_TOKEN_LIMIT = int(os.getenv('PROMPT_DOC_TOKEN_LIMIT', '400'))             # 문서 하나
+PROMPT_HISTORY_MESSAGE_TOKEN_LIMIT = int(os.getenv('PROMPT_HISTORY_MESSAGE_TOKEN_LIMIT', '200'))  # 메시지 하나
+MIN_DOC_TOKENS = 40  # 이보다 적게 남으면 잘라 넣지 않고 중단
+
+TRUNCATION_MARK = "…"
+TOKENIZER_ENCODING = "o200k_base"  # gpt-4o 계열
+
+_prompt_tokens = metrics.histogram(
+    'llm_prompt_tokens', '턴별 생성 프롬프트 토큰 수',
+    buckets=(250, 500, 1000, 2000, 3000, 4000, 6000, 8000, 12000, 16000),
+)
+_dropped_docs = metrics.counter('prompt_context_dropped_docs_total', '토큰 예산 초과로 제외된 검색 문서 수')
+
+# 렌더링 함수: (번호, 문서, 잘린 본문) → 프롬프트에 들어갈 문자열
+RenderFunc = Callable[[int, Document, str], str]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
+    """tiktoken 인코딩. 패키지나 인코딩 파일을 쓸 수 없으면 None (추정치 사용)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TOKENIZER_ENCODING)
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable, using estimated token counts: {str(e)}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """토큰 수. tiktoken이 없으면 UTF-8 바이트 수 / 3 으로 추정 (한글 1자 ≈ 1토큰, 영문 ≈ 3~4자/토큰)"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return (len(text.encode('utf-8')) + 2) // 3
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """text를 max_tokens 이하로 자릅니다. 잘린 경우 끝에 TRUNCATION_MARK를 붙입니다."""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _get_encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text)[:max_tokens - 1]).rstrip() + TRUNCATION_MARK
+    # 추정 모드: 바이트 예산 안에 들어가는 글자까지만
+    budget, end = (max_tokens - 1) * 3, 0
+    for end, ch in enumerate(text):
+        budget -= len(ch.encode('utf-8'))
+        if budget < 0:
+            break
+    return text[:end].rstrip() + TRUNCATION_MARK
+
+
+def pack_documents(results: Dict[str, List[Document]],
+                   render: RenderFunc,
+                   header: Callable[[str], str] = lambda category: f"## {category} 정보\n",
+                   budget: int = PROMPT_CONTEXT_TOKEN_BUDGET,
+                   doc_token_limit: int = PROMPT_DOC_TOKEN_LIMIT) -> Tuple[str, int]:
+    """
+    카테고리별 검색 결과를 토큰 예산 안에서 하나의 컨텍스트 문자열로 만듭니다.
+
+    relevance_score가 높은 문서부터 채우며(점수가 없는 날씨 등은 항상 먼저), 출력은
+    원래 카테고리 순서로 묶습니다. Returns (content, 사용한 토큰 수)
+    """
+    candidates = []
+    for order, (category, docs) in enumerate((c, d) for c, d in results.items() if d):
+        for position, doc in enumerate(docs):
+            score = (doc.metadata or {}).get("relevance_score")
+            candidates.append((float("inf") if score is None else score, order, position, category, doc))
+    candidates.sort(key=lambda c: (-c[0], c[1], c[2]))
+
+    selected: Dict[str, List[str]] = {category: [] for category, docs in results.items() if docs}
+    used, dropped = 0, 0
+    for _, _, _, category, doc in candidates:
+        entries = selected[category]
+        overhead = 0 if entries else count_tokens(header(category))
+        body = truncate_to_tokens(doc.page_content, doc_token_limit)
+        entry = render(len(entries) + 1, doc, body)
+        cost = overhead + count_tokens(entry)
+
+        if used + cost > budget:
+            # 본문을 남은 예산만큼 줄여서라도 넣을 수 있는지 확인
+            remaining = budget - used - (cost - count_tokens(body))
+            if remaining < MIN_DOC_TOKENS:
+                dropped += 1
+                continue
+            body = truncate_to_tokens(body, remaining)
+            entry = render(len(entries) + 1, doc, body)
+            cost = overhead + count_tokens(entry)
+            if used + cost > budget:
+                dropped += 1
+                continue
+
+        entries.append(entry)
+        used += cost
+
+    if dropped:
+        _dropped_docs.inc(dropped)
+        logger.info(f"Context budget {budget} tokens: dropped {dropped} of {len(candidates)} documents")
+
+    content = "\n".join(
+        header(category) + "".join(entries) for category, entries in selected.items() if entries
+    )
+    return content, used
+
+
+def pack_history(chat_history: List[Dict[str, str]],
+                 budget: int = PROMPT_HISTORY_TOKEN_BUDGET,
+                 message_token_limit: int = PROMPT_HISTORY_MESSAGE_TOKEN_LIMIT) -> List[Dict[str, str]]:
+    """최근 메시지부터 예산이 허락하는 만큼, 각 메시지를 상한 길이로 잘라 시간순으로 반환합니다."""
+    packed, used = [], 0
+    for msg in reversed(chat_history or []):
+        content = truncate_to_tokens(msg["content"], min(message_token_limit, budget - used))
+        cost = count_tokens(content)
+        if not content or used + cost > budget:
+            break
+        packed.append({**msg, "content": content})
+        used += cost
+    packed.reverse()
+    return packed
+
+
+def record_prompt_tokens(prompt_text: str, source: str) -> int:
+    """완성된 프롬프트의 토큰 수를 로그와 지표로 남깁니다."""
+    tokens = count_tokens(prompt_text)
+    _prompt_tokens.observe(tokens)
+    logger.info(f"[{source}] prompt tokens: {tokens}")
+    return tokens
@@ -1,102 +1,392 @@
-import subprocess
+import argparse
+import functools
 import json
 import os 
-from typing import List, Dict, Optional
+import threading
+import httpx
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Dict, Optional, Tuple
 from dotenv import load_dotenv 
+from tour_api_cache import get_tour_api_cache
 
 # load key 
 load_dotenv()
 service_key = os.getenv('TOUR_API_KEY')
 
+# KorPetTourService 호출 설정
+TOUR_API_BASE_URL = os.getenv('TOUR_API_BASE_URL', 'https://apis.data.go.kr/B551011/KorPetTourService')
+TOUR_API_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+TOUR_API_MAX_RESPONSE_BYTES = 2 * 1024 * 1024  # 응답 최대 크기 (2MB)
+# areaBasedList 페이지 크기. 캐시 키에 포함되므로 동기화 작업과 실시간 조회가 같은 값을 써야 캐시를 공유함
+AREA_LIST_PAGE_SIZE = 100
+
+# 반려동물 상세 정보 동시 조회 설정
+DETAIL_FETCH_CONCURRENCY = 8   # 동시에 보내는 상세 조회 요청 수
+DETAIL_FETCH_TIMEOUT = 3.0     # 상세 조회 1건당 타임아웃(초)
+DETAIL_FETCH_DEADLINE = 5.0    # 전체 상세 조회를 기다리는 최대 시간(초)
+_detail_executor = ThreadPoolExecutor(max_workers=DETAIL_FETCH_CONCURRENCY, thread_name_prefix="pet-detail")
+
+# 카테고리 → Tour API 콘텐츠 타입 ID
+CONTENT_TYPE_IDS = {
+    "관광지": 12,
+    "문화시설": 14,
+    "레포츠": 28,
+    "숙박": 32,
+    "쇼핑": 38,
+    "음식점": 39,
+}
+
+# 시/도·시군구 코드 테이블 (refresh_area_code_table로 생성)
+AREA_CODE_TABLE_PATH = Path(__file__).resolve().parent.parent / 'data' / 'json' / 'tour_area_codes.json'
+AREA_CODE_TABLE_VERSION = 1
+
+# 줄임말·행정구역 정식 명칭 → Tour API 시/도 이름
+REGION_ALIASES = {
+    "서울특별시": "서울", "서울시": "서울",
+    "인천광역시": "인천", "인천시": "인천",
+    "대전광역시": "대전", "대전시": "대전",
+    "대구광역시": "대구", "대구시": "대구",
+    "광주광역시": "광주",
+    "부산광역시": "부산", "부산시": "부산",
+    "울산광역시": "울산", "울산시": "울산",
+    "세종특별자치시": "세종특별자치시", "세종": "세종특별자치시", "세종시": "세종특별자치시",
+    "경기": "경기도",
+    "강원": "강원특별자치도", "강원도": "강원특별자치도",
+    "충북": "충청북도", "충남": "충청남도",
+    "경북": "경상북도", "경남": "경상남도",
+    "전북": "전북특별자치도", "전라북도": "전북특별자치도",
+    "전남": "전라남도",
+    "제주": "제주도", "제주특별자치도": "제주도",
+}
+
+class ResponseTooLargeError(Exception):
+    """응답 본문이 TOUR_API_MAX_RESPONSE_BYTES를 넘는 경우"""
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+def get_http_client() -> httpx.Client:
+    """keep-alive 커넥션 풀을 공유하는 HTTP 클라이언트 (스레드 안전)"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                timeout=TOUR_API_TIMEOUT,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=30.0),
+            )
+        return _http_client
+
+def close_http_client() -> None:
+    """공유 HTTP 클라이언트의 커넥션을 정리합니다."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+def _get_json(url: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """공유 클라이언트로 GET 요청을 보내고, 크기 제한 안에서 JSON 응답을 파싱합니다."""
+    request_timeout = TOUR_API_TIMEOUT if timeout is None else httpx.Timeout(timeout)
+    with get_http_client().stream('GET', url, timeout=request_timeout) as response:
+        response.raise_for_status()
+        body = bytearray()
+        for chunk in response.iter_bytes():
+            body.extend(chunk)
+            if len(body) > TOUR_API_MAX_RESPONSE_BYTES:
+                raise ResponseTooLargeError(f"response exceeds {TOUR_API_MAX_RESPONSE_BYTES} bytes: {url}")
+    return json.loads(bytes(body))
+
 def fetch_area_items(area_code: Optional[int] = None) -> List[Dict]:
     url = (
-        f"https://apis.data.go.kr/B551011/KorPetTourService/areaCode"
+        f"{TOUR_API_BASE_URL}/areaCode"
         f"?serviceKey={service_key}&MobileOS=ETC&MobileApp=TestApp&_type=json&numOfRows=100"
     )
     if area_code:
         url += f"&areaCode={area_code}"
-    result = subprocess.run(['curl', '-s', url], capture_output=True, text=True, check=True)
-    data = json.loads(result.stdout)
+    data = _get_json(url)
     return data["response"]["body"]["items"]["item"]
 
+def refresh_area_code_table(path: Path = AREA_CODE_TABLE_PATH) -> Dict[str, Any]:
+    """Tour API에서 시/도·시군구 코드 전체를 받아 버전이 있는 JSON 테이블로 저장합니다."""
+    areas = []
+    for area_item in fetch_area_items():
+        sigungu_items = fetch_area_items(area_code=area_item["code"])
+        areas.append({
+            "code": int(area_item["code"]),
+            "name": area_item["name"],
+            "sigungu": [{"code": int(item["code"]), "name": item["name"]} for item in sigungu_items],
+        })
+    table = {
+        "version": AREA_CODE_TABLE_VERSION,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "areas": areas,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False, indent=2)
+    load_area_code_index.cache_clear()
+    return table
+
+class AreaCodeIndex:
+    """
+    시/도·시군구 코드 테이블의 메모리 인덱스.
+    정식 명칭, 접미사(시/군/구)를 뗀 이름, 별칭을 모두 dict로 색인합니다.
+    """
+
+    def __init__(self, table: Dict[str, Any]):
+        self.version = table.get("version")
+        self.generated_at = table.get("generated_at")
+        self.names: Dict[str, Tuple[int, Optional[int]]] = {}
+        # 포함 관계로 찾는 기존 방식의 탐색 순서 (시/도 전체 → 시군구 전체)
+        self.entries: List[Tuple[str, int, Optional[int]]] = []
+
+        areas = table.get("areas", [])
+        for area in areas:
+            self.entries.append((area["name"], area["code"], None))
+            self.names.setdefault(area["name"], (area["code"], None))
+        for area in areas:
+            for sigungu in area.get("sigungu", []):
+                codes = (area["code"], sigungu["code"])
+                self.entries.append((sigungu["name"], *codes))
+                self.names.setdefault(sigungu["name"], codes)
+                stripped = sigungu["name"].rstrip("시군구")
+                if len(stripped) >= 2:
+                    self.names.setdefault(stripped, codes)
+        for alias, name in REGION_ALIASES.items():
+            if name in self.names:
+                self.names.setdefault(alias, self.names[name])
+
+    def match(self, region: str) -> Tuple[Optional[int], Optional[int]]:
+        """지역명을 (시/도 코드, 시군구 코드)로 변환합니다."""
+        region = region.strip()
+        if region in self.names:
+            return self.names[region]
+        for name, area_code, sigungu_code in self.entries:
+            if region in name or name in region:
+                return area_code, sigungu_code
+        return None, None
+
+class AreaCodeTableError(Exception):
+    """지역 코드 테이블이 없거나 버전이 맞지 않는 경우"""
+
+@functools.lru_cache(maxsize=None)
+def load_area_code_index(path: Path = AREA_CODE_TABLE_PATH) -> AreaCodeIndex:
+    """
+    코드 테이블을 한 번만 읽어 인덱스를 만듭니다. 요청 경로에서 API를 호출하지 않습니다.
+    테이블이 없거나 버전이 다르면 AreaCodeTableError를 올립니다 (lru_cache는 예외를 캐시하지 않으므로
+    테이블이 생성되면 다음 호출부터 바로 사용됨).
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            table = json.load(f)
+    except FileNotFoundError:
+        raise AreaCodeTableError(f"지역 코드 테이블이 없습니다: {path} (--refresh-area-codes로 생성하세요)")
+    if table.get("version") != AREA_CODE_TABLE_VERSION:
+        raise AreaCodeTableError(f"지역 코드 테이블 버전 불일치({table.get('version')}): {path} "
+                                 f"(--refresh-area-codes로 다시 생성하세요)")
+    return AreaCodeIndex(table)
+
+def preload_area_code_index() -> AreaCodeIndex:
+    """
+    앱 시작 시 코드 테이블을 미리 읽어 둡니다 (첫 요청이 테이블을 읽거나 만들지 않도록).
+    테이블이 없거나 버전이 다르면 여기서 Tour API로 한 번 생성하고, 그것도 실패하면 예외를 올려
+    지역 매핑 없이 조용히 뜨는 대신 시작을 중단합니다.
+    """
+    try:
+        index = load_area_code_index()
+    except AreaCodeTableError as e:
+        print(f"⚠️ {e} → Tour API로 생성합니다")
+        try:
+            refresh_area_code_table()
+        except Exception as refresh_error:
+            raise AreaCodeTableError(f"지역 코드 테이블 생성 실패: {refresh_error}") from refresh_error
+        index = load_area_code_index()
+    if not index.entries:
+        raise AreaCodeTableError(f"지역 코드 테이블이 비어 있습니다: {AREA_CODE_TABLE_PATH}")
+    print(f"✅ 지역 코드 테이블 로드: {len(index.entries)}개 지역 (generated_at={index.generated_at})")
+    return index
+
 def match_region_to_codes(region: str) -> (Optional[int], Optional[int]):
     """지역명을 시/도 및 시/군/구로 매핑"""
     try:
-        # 1. 시/도 목록에서 일치 또는 포함되는 지역 찾기
-        area_items = fetch_area_items()
-        for item in area_items:
-            if region in item["name"] or item["name"] in region:
-                return item["code"], None
-
-        # 2. 각 시/도의 시군구 목록에서 찾기
-        for area_item in area_items:
-            area_code = area_item["code"]
-            sigungu_items = fetch_area_items(area_code=area_code)
-            for sigungu in sigungu_items:
-                if region in sigungu["name"] or sigungu["name"] in region:
-                    return area_code, sigungu["code"]
-                
+        return load_area_code_index().match(region)
     except Exception as e:
         print("❌ 지역 매핑 실패:", e)
     return None, None
 
-def fetch_area_based_places(area_code: int, service_key: str, sigungu_code: Optional[int] = None, limit: int = 5) -> List[Dict]:
-    """지역 기반 관광지 검색"""
+def iter_area_based_places(area_code: int, content_type_id: int, sigungu_code: Optional[int] = None,
+                           use_cache: bool = True, api_key: Optional[str] = None) -> Iterator[Dict]:
+    """
+    areaBasedList를 AREA_LIST_PAGE_SIZE 단위 페이지로 필요한 만큼만 순회합니다.
+    소비측이 멈추면 다음 페이지를 요청하지 않습니다.
+    """
+    page_no = 1
+    while True:
+        items, total_count = fetch_area_based_page(area_code, content_type_id, page_no, AREA_LIST_PAGE_SIZE,
+                                                   sigungu_code=sigungu_code, use_cache=use_cache,
+                                                   api_key=api_key)
+        yield from items
+        if not items or page_no * AREA_LIST_PAGE_SIZE >= total_count:
+            return
+        page_no += 1
+
+def fetch_area_based_places(area_code: int, service_key: str, sigungu_code: Optional[int] = None, limit: int = 5,
+                            content_type_id: int = CONTENT_TYPE_IDS["관광지"],
+                            predicate: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+    """
+    지역 기반 장소 검색 (로컬 캐시 우선)
+    content_type_id로 콘텐츠 타입(관광지 12, 숙박 32, 음식점 39 등)을 지정하고,
+    predicate를 통과한 항목이 limit개 모이면 남은 페이지는 요청하지 않습니다.
+    페이지 크기는 limit과 관계없이 고정이라 동기화 작업이 채운 캐시를 그대로 씁니다.
+    """
+    results: List[Dict] = []
+    if limit <= 0:
+        return results
+    try:
+        for item in iter_area_based_places(area_code, content_type_id, sigungu_code=sigungu_code,
+                                           api_key=service_key):
+            if predicate is None or predicate(item):
+                results.append(item)
+                if len(results) >= limit:
+                    break
+    except Exception as e:
+        print("❌ 장소 목록 조회 실패:", e)
+    return results
+
+def fetch_area_based_page(area_code: int, content_type_id: int, page_no: int = 1,
+                          num_of_rows: int = AREA_LIST_PAGE_SIZE,
+                          sigungu_code: Optional[int] = None, use_cache: bool = True,
+                          api_key: Optional[str] = None) -> Tuple[List[Dict], int]:
+    """
+    areaBasedList 한 페이지를 조회합니다. 요청 실패 시 예외를 그대로 올립니다.
+    Returns (해당 페이지 항목 목록, 전체 항목 수)
+    """
+    cache = get_tour_api_cache()
+    if use_cache:
+        cached = cache.get_place_list(area_code, sigungu_code, content_type_id, page_no, num_of_rows)
+        if cached is not None:
+            return cached["items"], cached["total_count"]
     url = (
-        f"https://apis.data.go.kr/B551011/KorPetTourService/areaBasedList"
-        f"?serviceKey={service_key}&MobileOS=ETC&MobileApp=TestApp&_type=json"
-        f"&pageNo=1&numOfRows={limit}&arrange=C&contentTypeId=12&areaCode={area_code}&listYN=Y"
+        f"{TOUR_API_BASE_URL}/areaBasedList"
+        f"?serviceKey={api_key or service_key}&MobileOS=ETC&MobileApp=TestApp&_type=json"
+        f"&pageNo={page_no}&numOfRows={num_of_rows}&arrange=C&contentTypeId={content_type_id}"
+        f"&areaCode={area_code}&listYN=Y"
     )
     if sigungu_code:
         url += f"&sigunguCode={sigungu_code}"
-    try:
-        result = subprocess.run(['curl', '-s', url], capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-        return data.get("response", {}).get("body", {}).get("items", {}).get("item", [])
-    except Exception as e:
-        print("❌ 관광지 목록 조회 실패:", e)
-    return []
+    body = _get_json(url).get("response", {}).get("body", {})
+    items = body.get("items") or {}
+    items = items.get("item", []) if isinstance(items, dict) else []
+    if isinstance(items, dict):
+        items = [items]
+    total_count = int(body.get("totalCount") or 0)
+    cache.set_place_list(area_code, sigungu_code, content_type_id, page_no, num_of_rows,
+                         {"items": items, "total_count": total_count})
+    return items, total_count
 
-def get_pet_tour_detail(contentid: int, service_key: str) -> str:
+def _request_pet_tour_detail(contentid: int, service_key: str, timeout: Optional[float] = None) -> str:
+    """detailPetTour를 호출합니다. 요청·파싱 실패 시 예외를 그대로 올립니다."""
     url = (
-        f"https://apis.data.go.kr/B551011/KorPetTourService/detailPetTour"
+        f"{TOUR_API_BASE_URL}/detailPetTour"
         f"?serviceKey={service_key}&MobileOS=ETC&MobileApp=TestApp&_type=json&contentId={contentid}"
     )
+    data = _get_json(url, timeout=timeout)
+    items = data.get("response", {}).get("body", {}).get("items", {}).get("item", {})
+    if isinstance(items, list):
+        return items[0].get("acmpyPsblCpam", "정보 없음")
+    elif isinstance(items, dict):
+        return items.get("acmpyPsblCpam", "정보 없음")
+    return "정보 없음"
+
+def get_pet_tour_detail(contentid: int, service_key: str, timeout: Optional[float] = None,
+                        modifiedtime: Optional[str] = None) -> str:
+    """반려동물 동반 정보 조회 (로컬 캐시 우선, 성공한 응답만 캐시)"""
+    cache = get_tour_api_cache()
+    cached = cache.get_pet_detail(contentid, modifiedtime)
+    if cached is not None:
+        return cached
     try:
-        result = subprocess.run(['curl', '-s', url], capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-        items = data.get("response", {}).get("body", {}).get("items", {}).get("item", {})
-        if isinstance(items, list):
-            return items[0].get("acmpyPsblCpam", "정보 없음")
-        elif isinstance(items, dict):
-            return items.get("acmpyPsblCpam", "정보 없음")
+        pet_info = _request_pet_tour_detail(contentid, service_key, timeout=timeout)
+        cache.set_pet_detail(contentid, pet_info, modifiedtime)
+        return pet_info
     except Exception as e:
         print(f"❌ 상세 정보 조회 실패(contentid={contentid}):", e)
     return "정보 없음"
 
-def fetch_pet_friendly_places_only(user_input: Dict, limit: int = 5) -> List[Dict]:
+def fetch_pet_details(contentids: List[int], service_key: str,
+                      deadline: float = DETAIL_FETCH_DEADLINE,
+                      modified_times: Optional[Dict[int, str]] = None) -> Dict[int, str]:
+    """
+    여러 장소의 반려동물 동반 정보를 동시에 조회합니다.
+    로컬 캐시에 있는 항목은 바로 채우고, 나머지만 API로 조회합니다.
+    deadline 안에 끝나지 않은 조회는 결과에서 빠지므로, 호출측은 부분 결과를 받습니다.
+    """
+    modified_times = modified_times or {}
+    cache = get_tour_api_cache()
+    results: Dict[int, str] = {}
+    missing = []
+    for contentid in contentids:
+        cached = cache.get_pet_detail(contentid, modified_times.get(contentid))
+        if cached is not None:
+            results[contentid] = cached
+        else:
+            missing.append(contentid)
+    if not missing:
+        return results
+
+    futures = {
+        _detail_executor.submit(get_pet_tour_detail, contentid, service_key, DETAIL_FETCH_TIMEOUT,
+                                modified_times.get(contentid)): contentid
+        for contentid in missing
+    }
+    done, not_done = wait(futures, timeout=deadline)
+    for future in not_done:
+        future.cancel()
+    if not_done:
+        print(f"⚠️ 상세 정보 조회 {len(not_done)}건이 {deadline}초 안에 끝나지 않았습니다.")
+    results.update({futures[future]: future.result() for future in done})
+    return results
+
+def fetch_pet_friendly_places_only(user_input: Dict, limit: int = 5,
+                                   content_type_id: int = CONTENT_TYPE_IDS["관광지"],
+                                   predicate: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
     region = user_input["region"]
-    print(region)
     area_code, sigungu_code = match_region_to_codes(region)
     if not area_code:
         return []
-    api_results = fetch_area_based_places(area_code, service_key, sigungu_code=sigungu_code, limit=limit)
+    api_results = fetch_area_based_places(area_code, service_key, sigungu_code=sigungu_code, limit=limit,
+                                          content_type_id=content_type_id, predicate=predicate)
+    details = fetch_pet_details(
+        [place["contentid"] for place in api_results], service_key,
+        modified_times={place["contentid"]: place.get("modifiedtime") for place in api_results},
+    )
     for place in api_results:
-        place["pet_info"] = get_pet_tour_detail(place["contentid"], service_key)
+        place["pet_info"] = details.get(place["contentid"], "정보 없음")
 
     return api_results
 
 
-# if __name__ == '__main__':
-#     user_input = {
-#         "region": "부산",
-#         "pet_type": "강아지",
-#         "days": 2,
-#         "transport_mode": "자가용"
-#     }
-    
-#     results = fetch_pet_friendly_places_only(user_input)
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="KorPetTourService 유틸리티")
+    parser.add_argument("--refresh-area-codes", action="store_true", help="시/도·시군구 코드 테이블을 새로 생성")
+    parser.add_argument("--region", help="반려동물 동반 가능 관광지를 조회할 지역명 (예: 부산)")
+    args = parser.parse_args()
+
+    if args.refresh_area_codes:
+        table = refresh_area_code_table()
+        sigungu_count = sum(len(area["sigungu"]) for area in table["areas"])
+        print(f"✅ {AREA_CODE_TABLE_PATH} 생성: 시/도 {len(table['areas'])}개, 시군구 {sigungu_count}개")
 
-#     for i, item in enumerate(results, 1):
-#         print(f"{i}. {item['title']} - {item.get('addr1', '주소 없음')}")
-#         print(f"   🐶 동반 가능: {item['pet_info']}")
\ No newline at end of file
+    if args.region:
+        user_input = {
+            "region": args.region,
+            "pet_type": "강아지",
+            "days": 2,
+            "transport_mode": "자가용"
+        }
+        results = fetch_pet_friendly_places_only(user_input)
+        for i, item in enumerate(results, 1):
+            print(f"{i}. {item['title']} - {item.get('addr1', '주소 없음')}")
+            print(f"   🐶 동반 가능: {item['pet_info']}")
@@ -0,0 +1,168 @@
+"""
+Aho–Corasick 기반 다중 키워드 매처.
+
+키워드 목록을 한 번만 오토마톤으로 컴파일해 두고, 질의 길이에 비례하는 한 번의 순회로
+모든 키워드를 찾습니다. 인사말·카테고리 키워드·장소 타입 검사에서 공유합니다.
+
+매칭 규칙
+- 영문은 대소문자를 구분하지 않습니다 (ASCII만 소문자로 변환).
+- 영문/숫자로 시작하거나 끝나는 키워드는 앞뒤가 영문/숫자가 아닐 때만 매칭합니다
+  ("hi"는 "this"나 "history" 안에서 매칭되지 않음).
+- 한글 키워드는 조사가 붙는 경우가 많으므로 부분 문자열로 매칭합니다 ("안녕하세요" 안의 "안녕").
+"""
+import re
+from collections import deque
+from typing import Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+# 이 개수 이하의 키워드 집합은 오토마톤 대신 키워드별 str.find로 찾음 (결과는 같음)
+SMALL_SET_SIZE = 12
+
+
+def _normalize(text: str) -> str:
+    """ASCII 대문자만 소문자로 (문자 위치가 바뀌지 않도록)"""
+    return text.translate(_ASCII_LOWER)
+
+
+def _is_ascii_word_char(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+class KeywordMatcher:
+    """
+    키워드(→ 라벨) 집합을 한 번에 찾는 Aho–Corasick 오토마톤.
+    키워드가 SMALL_SET_SIZE개 이하이면 같은 규칙으로 키워드별 str.find(search는 정규식)를 사용합니다.
+
+        matcher = KeywordMatcher({"ktx": "대중교통", "펜션": "숙박"})
+        matcher.labels("KTX 타고 펜션 가기")  # ['대중교통', '숙박']
+    """
+
+    def __init__(self, keywords: Union[Mapping[str, Hashable], Iterable[str]]):
+        if not isinstance(keywords, Mapping):
+            keywords = {keyword: keyword for keyword in keywords}
+
+        # 노드별 전이, 실패 링크, 출력 (키워드, 라벨, 앞 경계 필요, 뒤 경계 필요)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, Hashable, bool, bool]]] = [[]]
+        self._keywords: List[Tuple[str, Hashable, bool, bool]] = []
+
+        for keyword, label in keywords.items():
+            if not keyword:
+                continue
+            normalized = _normalize(keyword)
+            node = 0
+            for ch in normalized:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            if self._out[node]:
+                continue  # 대소문자만 다른 중복 키워드
+            entry = (normalized, label, _is_ascii_word_char(normalized[0]), _is_ascii_word_char(normalized[-1]))
+            self._out[node].append(entry)
+            self._keywords.append(entry)
+
+        # BFS로 실패 링크를 만들고 출력을 접미사 노드의 출력과 합침
+        order = []
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+        # 실패 링크를 따라가는 전이를 미리 펼쳐 둠 (매칭 시 문자당 dict 조회 한 번)
+        self._delta: List[Dict[str, int]] = [dict(g) for g in self._goto]
+        for node in order:
+            for ch, nxt in self._delta[self._fail[node]].items():
+                self._delta[node].setdefault(ch, nxt)
+
+        # 키워드가 적으면 키워드별 str.find(C 구현)가 문자 단위 순회보다 빠름
+        self._use_find = len(self._keywords) <= SMALL_SET_SIZE
+        # search()용: 부분 문자열 검사로 먼저 걸러내고, 걸린 경우만 경계 조건을 정규식으로 확인
+        # (경계 조건은 전후방 탐색으로, 대소문자는 ASCII만 무시)
+        self._prefilter = tuple(keyword for keyword, _, _, _ in self._keywords)
+        # str.lower()가 키워드 글자를 바꾸지 않을 때만 빠른 lower()를, 아니면 ASCII 변환을 사용
+        self._prefilter_lower = all(ch.lower() == ch for keyword in self._prefilter for ch in keyword)
+        self._search_pattern = re.compile("|".join(
+            ("(?<![A-Za-z0-9])" if bound_start else "") + re.escape(keyword)
+            + ("(?![A-Za-z0-9])" if bound_end else "")
+            for keyword, _, bound_start, bound_end in self._keywords
+        ), re.IGNORECASE | re.ASCII) if self._use_find and self._keywords else None
+
+    @staticmethod
+    def _accept(normalized: str, start: int, end: int, bound_start: bool, bound_end: bool) -> bool:
+        if bound_start and start > 0 and _is_ascii_word_char(normalized[start - 1]):
+            return False
+        if bound_end and end < len(normalized) and _is_ascii_word_char(normalized[end]):
+            return False
+        return True
+
+    def _scan_find(self, normalized: str) -> List[Tuple[int, int, str, Hashable]]:
+        matches = []
+        for keyword, label, bound_start, bound_end in self._keywords:
+            start = normalized.find(keyword)
+            while start != -1:
+                end = start + len(keyword)
+                if self._accept(normalized, start, end, bound_start, bound_end):
+                    matches.append((start, end, keyword, label))
+                start = normalized.find(keyword, start + 1)
+        matches.sort(key=lambda match: (match[1], -len(match[2])))
+        return matches
+
+    def _scan_automaton(self, normalized: str) -> Iterator[Tuple[int, int, str, Hashable]]:
+        delta, out = self._delta, self._out
+        node = 0
+        for end, ch in enumerate(normalized, 1):
+            node = delta[node].get(ch, 0)
+            if out[node]:
+                for keyword, label, bound_start, bound_end in out[node]:
+                    start = end - len(keyword)
+                    if self._accept(normalized, start, end, bound_start, bound_end):
+                        yield start, end, keyword, label
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str, Hashable]]:
+        """(시작, 끝, 키워드, 라벨)을 끝 위치 순서로 생성합니다."""
+        if not text:
+            return iter(())
+        normalized = _normalize(text)
+        if self._use_find:
+            return iter(self._scan_find(normalized))
+        return self._scan_automaton(normalized)
+
+    def search(self, text: str) -> bool:
+        """키워드가 하나라도 있으면 True"""
+        if not self._use_find:
+            return next(self.iter_matches(text), None) is not None
+        if not text or self._search_pattern is None:
+            return False
+        # 키워드 글자가 lower()에 불변이면 lower()한 본문에도 실제 매칭 위치의 글자가 그대로 남음
+        lowered = text.lower() if self._prefilter_lower else _normalize(text)
+        for keyword in self._prefilter:
+            if keyword in lowered:
+                return self._search_pattern.search(text) is not None
+        return False
+
+    def first(self, text: str) -> Optional[Hashable]:
+        """가장 먼저 끝나는 매칭의 라벨 (없으면 None)"""
+        match = next(self.iter_matches(text), None)
+        return match[3] if match else None
+
+    def labels(self, text: str) -> List[Hashable]:
+        """매칭된 라벨 목록 (처음 등장한 순서, 중복 제거)"""
+        seen: Dict[Hashable, None] = {}
+        for _, _, _, label in self.iter_matches(text):
+            seen.setdefault(label, None)
+        return list(seen)
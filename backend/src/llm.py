@@ -1,9 +1,9 @@
 """ Pet Travel Chatbot System"""
 import logging
+import threading
 import traceback
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from langchain.schema import Document
-from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 import os
@@ -17,10 +17,16 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 import vector_manger as vm
-from module import get_category, get_user_parser, get_naver_map_link
+import prompts
+from query_rules import extract_weather_region, is_greeting
+from weather_answer import answer_weather_query
+from context_builder import pack_documents, pack_history, record_prompt_tokens
+from module import get_category, get_user_parser, get_naver_map_link, get_llm
+from naver_map_utils import NaverMapUtils
 from weather import get_weather, get_current_time
 from app.models.db import get_db
-from app.models.chat import ChatLog
+from app.models.chat import ChatLog, Session as ChatSession
+from session_summary import schedule_summary_update, shutdown_summarizer
 
 # Load environment variables
 load_dotenv()
@@ -39,28 +45,36 @@ class Chatbot: # 챗봇 클래스
     """ Pet Travel Chatbot"""
     
     def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o-mini", api_key=openai_api_key, temperature=0.3)
+        self.llm = get_llm("gpt-4o-mini", temperature=0.3)
         logger.info(" Chatbot initialized")
     
-    def process_query(self, query: str, session_id: Optional[int] = None, stream: bool = False) -> str:
-        """Main processing pipeline"""
+    def process_query(self, query: str, session_id: Optional[int] = None, stream: bool = False,
+                      skip_greeting: bool = False) -> str:
+        """Main processing pipeline (skip_greeting: caller already ran check_greeting)"""
         try:
             # Check greetings first
-            greeting_response = self.check_greeting(query)
-            if greeting_response:
-                return greeting_response
+            if not skip_greeting:
+                greeting_response = self.check_greeting(query)
+                if greeting_response:
+                    return greeting_response
             
-            # 이전 대화 내역 가져오기
-            chat_history = []
+            # 날씨만 묻는 질의는 검색·LLM 없이 템플릿으로 바로 응답
+            weather_answer = answer_weather_query(query)
+            if weather_answer:
+                return weather_answer
+            
+            # 이전 대화 맥락 가져오기 (누적 요약 + 직전 사용자 질문)
+            summary, chat_history = None, []
             if session_id:
-                chat_history = self._get_chat_history(session_id)
+                summary, chat_history = self._get_session_context(session_id, query)
             
             # Analyze query
             categories = get_category(query)
             user_parsed = get_user_parser(query)
             
-            # Search VectorDB
-            results = vm.multiretrieve_by_category(query=query, categories=categories, k_each=10, top_k=10)
+            # Search VectorDB (후보 20개 중 관련도가 높은 앞부분만 최대 10개)
+            results = vm.multiretrieve_by_category(query=query, categories=categories, k_each=20, top_k=10,
+                                                   adaptive=True)
             
             # Handle weather separately
             if "날씨" in categories:
@@ -75,12 +89,45 @@ class Chatbot: # 챗봇 클래스
                     results["날씨"] = [Document(page_content="지역을 명시해주세요. (예: 서울 날씨, 부산 날씨)", metadata={})]
             
             # Generate response
-            return self._generate_response(query, user_parsed, results, chat_history)
+            response = self._generate_response(query, user_parsed, results, chat_history, summary)
+            # 대화 요약은 LLM이 생성한 답변만 반영 (인사·날씨 템플릿 응답은 LLM 호출 없이 끝내도록)
+            if session_id:
+                schedule_summary_update(session_id, query, response)
+            return response
             
         except Exception as e:
             logger.error(f"Error: {str(e)}")
             return "죄송합니다. 요청을 처리하는 중 오류가 발생했습니다."
     
+    def _get_session_context(self, session_id: int, query: str) -> Tuple[Optional[str], List[Dict[str, str]]]:
+        """
+        세션의 누적 요약과 직전 사용자 질문을 가져옵니다.
+        요약이 아직 없으면(첫 턴 직후 등) 최근 대화 내역으로 대신합니다.
+        
+        Args:
+            session_id: sessions.id (ChatLog.session_id가 참조하는 값)
+        """
+        db = next(get_db())
+        try:
+            session = db.query(ChatSession).filter(ChatSession.id == session_id).first()
+            if session is None or not session.summary:
+                return None, self._get_chat_history(session_id)
+            
+            # 현재 질문이 이미 저장되어 있을 수 있으므로 그 이전 사용자 질문을 찾음
+            recent_user_messages = db.query(ChatLog).filter(
+                ChatLog.session_id == session_id,
+                ChatLog.sender == "user"
+            ).order_by(ChatLog.timestamp.desc()).limit(2).all()
+            last_user_turn = next((msg.message for msg in recent_user_messages if msg.message != query), None)
+            
+            chat_history = [{"role": "user", "content": last_user_turn}] if last_user_turn else []
+            return session.summary, chat_history
+        except Exception as e:
+            logger.error(f"Error getting session context: {str(e)}")
+            return None, []
+        finally:
+            db.close()
+    
     def _get_chat_history(self, session_id: int) -> List[Dict[str, str]]:
         """세션 ID에 해당하는 이전 대화 내역을 가져옵니다."""
         try:
@@ -139,10 +186,7 @@ class Chatbot: # 챗봇 클래스
     
     def check_greeting(self, query: str) -> Optional[str]:
         """Check for greetings"""
-        greetings = ["안녕", "안녕하세요", "hello", "hi"]
-        query_lower = query.lower().strip()
-        
-        if any(greeting in query_lower for greeting in greetings):
+        if is_greeting(query):
             return """# 안녕하세요! 🐶 반려동물 여행 전문 도우미입니다.
                         
 ## 다음과 같은 도움을 드릴 수 있어요:
@@ -170,6 +214,8 @@ class Chatbot: # 챗봇 클래스
 * **습도**: {weather_data['humidity']}%
 * **강수형태**: {weather_data['precipitation_type']}
 * **풍속**: {weather_data['wind_speed']} m/s"""
+                if weather_data.get('stale'):
+                    content += "\n* *기상청 응답이 지연되어 직전 발표 기준 정보를 안내합니다.*"
                 return [Document(page_content=content, metadata=weather_data)]
             else:
                 # 날씨 정보를 가져오지 못한 경우 기본 응답 제공
@@ -227,119 +273,39 @@ class Chatbot: # 챗봇 클래스
     def _search_vector_db(self, query: str, categories: List[str]) -> Dict[str, List[Document]]:
         """Search vector database for each category"""
         try:
-            return vm.multiretrieve_by_category(query=query, categories=categories, k_each=10, top_k=10)
+            return vm.multiretrieve_by_category(query=query, categories=categories, k_each=20, top_k=10,
+                                                adaptive=True)
         except Exception as e:
             logger.error(f"Error searching vector DB: {str(e)}")
             return {}
     
     def _generate_response(self, query: str, user_parsed: Dict[str, Any], 
-                        results: Dict[str, List[Document]], chat_history: List[Dict[str, str]] = None) -> str:
+                        results: Dict[str, List[Document]], chat_history: List[Dict[str, str]] = None,
+                        summary: Optional[str] = None) -> str:
         """Generate final response"""
-        content_sections = []
+        def render(i: int, doc: Document, body: str) -> str:
+            metadata = doc.metadata
+            place_name = NaverMapUtils.place_name(metadata)
+            map_link = metadata.get("map_link") or (get_naver_map_link(place_name) if place_name else "#")
+            place_name = place_name or f"장소 {i}"
+            return f"### {i}. [{place_name}]({map_link})\n" + body + "\n\n"
         
-        for category, docs in results.items():
-            if not docs:
-                continue
-                
-            category_content = f"## {category} 정보\n"
-            
-            for i, doc in enumerate(docs, 1):
-                metadata = doc.metadata
-                place_name = metadata.get("title", f"장소 {i}")
-                map_link = get_naver_map_link(place_name) if place_name != f"장소 {i}" else "#"
-                
-                place_info = f"### {i}. [{place_name}]({map_link})\n"
-                place_info += doc.page_content + "\n\n"
-                category_content += place_info
-            
-            content_sections.append(category_content)
+        # 토큰 예산 안에서 점수 높은 문서부터 채움
+        content, _ = pack_documents(results, render)
         
-        content = "\n".join(content_sections)
-        
-        # 대화 히스토리 포맷팅
+        # 대화 히스토리 포맷팅 (최근 메시지부터 예산 안에서)
+        chat_history = pack_history(chat_history)
         chat_history_text = ""
+        if summary:
+            chat_history_text = f"## 이전 대화 요약\n{summary}\n\n"
         if chat_history and len(chat_history) > 0:
-            chat_history_text = "## 이전 대화 내역\n"
+            chat_history_text += "## 이전 대화 내역\n"
             for msg in chat_history:
                 role = "사용자" if msg["role"] == "user" else "챗봇"
                 chat_history_text += f"**{role}**: {msg['content']}\n\n"
         
-        template ="""
-당신은 반려동물과의 여행을 도와주는 감성적인 여행 플래너, 가이드 입니다.  
-아래 정보에 따라 **정확히 '장소 질의'인지, '날씨 응답'인지, '여행 코스 요청'인지 구분하여 답변**하세요.
-
----
-🧾 사용자 질문: {query}  
-📍 지역: {region}  
-🐕 반려동물: {pet_type}  
-🗓️ 여행 기간: {days}일  
-
-{chat_history}
-
-🔍 제공된 정보:  
-{content}
----
-
-🎯 작성 지침:
-
-1. **사용자가 특정 장소(G2, OO카페 등)의 위치나 정체를 묻는 질문**인 경우에는  
-    - 장소 이름, 위치, 간단한 설명, 지도 링크를 포함하세요.
-    - *장소가 DB에 없으면 ‘정확한 정보를 찾기 어려워요’라고 말해주세요.*
-    - **여행 일정이나 날씨 정보는 절대 포함하지 마세요.**
-    - 예시:
-    
-    ### 📍 G2 (부산 영도)
-    - 위치: 부산광역시 영도구 동삼동 123-4
-    - 설명: 영도 해양과학기술원 근처에 위치한 문화 복합공간입니다.
-    - 지도 링크: [네이버지도에서 보기](https://map.naver.com/v5/search/G2%20영도)
-
-2. **사용자가 '날씨'만 요청한 경우에는**,  
-    - 해당지역 기온/날씨/풍속/습도 + 반려동물 외출 시 유의사항 포함  
-    - 날씨 외 정보는 작성하지 마세요
-    - 예시는 다음과 같아요:
-
-    # 서울 날씨 정보
-
-    ## 🌤️ 오늘의 서울 날씨
-    * 🌡️ **기온**: 18.5°C
-    * 💧 **습도**: 55%
-    * 🌬️ **바람**: 1.5 m/s
-    * 🌤️ **날씨 상태**: 맑음
-
-    맑고 산뜻한 날씨네요!  
-    반려동물과 외출하시기 좋은 날이에요. 🐶💕
-
-    ## 🐾 외출 시 주의사항
-    * 햇빛이 강할 수 있으니 **그늘에서 쉬는 시간**을 자주 주세요.
-    * **수분 보충**을 위해 물을 꼭 챙겨주세요.
-    * **뜨거운 아스팔트**로부터 발바닥을 보호해 주세요.
-
-3. **'여행 코스' 요청일 경우에는** `## 🐾 1일차, 2일차` 등으로 일정 구성  
-    - 오전 → 점심 → 오후 → 저녁 순서
-    - 각 장소는 이름 + 설명 + 반려동물 동반 여부
-
-4. **날씨 + 여행 일정이 모두 포함된 경우**  
-    👉 먼저 날씨 정보를 출력하고 → 아래에 여행 일정을 이어서 작성
-
-5. **숙소 추천이 필요한 경우**,  
-    - 마지막 또는 별도 섹션에 `## 🏨 숙소 추천` 제목으로 정리  
-    - 숙소명, 위치, 반려동물 동반 여부, 특징, 추가요금 여부
-
-6. 전체 말투는 따뜻하고 친근하게. 여행을 함께 준비하는 친구처럼 작성해주세요.
-
-7. 🐾, 🌳, 🍽️, 🐶, ✨ 등의 이모지를 적절히 활용해 가독성과 감성을 살려주세요.
-
-8. 마지막에는 감성적인 인사로 마무리해주세요.  
-    - 예: "반려견과 함께하는 이번 여행이 오래도록 기억에 남기를 바랍니다! 🐕💕"
-
-9. 모든 응답은 마크다운 형식으로 작성해주세요.  
-   - 제목은 #, ##, ### 등을 사용하고, 목록은 *, - 등을 사용하세요.  
-   - 강조가 필요한 부분은 **강조** 또는 *기울임*을 사용하세요.
-
-10. 이전 대화 내역이 있다면 그 내용을 참고하여 더 연속성 있고 맥락에 맞는 답변을 제공해주세요.
-    - 사용자가 이전에 언급한 선호도, 장소, 반려동물 정보 등을 기억하고 활용하세요.
-"""
-        prompt = PromptTemplate.from_template(template)
+        # 고정 지침은 system, 요청별 정보는 human 메시지로 (프롬프트 캐시 재사용)
+        prompt = prompts.response_prompt()
         inputs = {
             "query": query,
             "region": user_parsed.get("region", "정보 없음"),
@@ -348,58 +314,33 @@ class Chatbot: # 챗봇 클래스
             "content": content or "관련 정보를 찾을 수 없습니다.",
             "chat_history": chat_history_text
         }
+        record_prompt_tokens(prompt.format(**inputs), "chatbot")
         
         chain = prompt | self.llm | StrOutputParser()
         return chain.invoke(inputs)
 
     def _extract_weather_region(self, query: str) -> Optional[str]:
         """Extract region from weather queries using simple parsing"""
-        import re
-        
-        # Common weather keywords and modifiers to exclude
-        weather_keywords = ["날씨", "기온", "온도", "비", "눈", "바람", "습도", "맑", "흐림", "현재", "지금", "오늘", "내일", "어때"]
-        
-        # Check if it's a weather query
-        if not any(keyword in query for keyword in ["날씨", "기온", "온도"]):
-            return None
-            
-        # Simple region extraction patterns - prioritize patterns that come before weather keywords
-        city_patterns = [
-            r'([가-힣]+(?:시|구|군|도))\s*(?:의\s*)?(?:날씨|기온|온도|현재)',  # 서울시 날씨, 강남구 날씨
-            r'([가-힣]+)\s*(?:의\s*)?(?:날씨|기온|온도)',      # 서울 날씨, 서울의 날씨
-            r'([가-힣]+)\s+(?:현재|지금)',                    # 서울 현재, 부산 지금
-        ]
-        
-        for pattern in city_patterns:
-            match = re.search(pattern, query)
-            if match:
-                candidate = match.group(1)
-                if candidate not in weather_keywords:
-                    return candidate
-        
-        # Fallback: find the first meaningful Korean word that's not a weather keyword
-        words = re.findall(r'[가-힣]+', query)
-        for word in words:
-            if word not in weather_keywords and len(word) >= 2:
-                return word
-                
-        return None
+        return extract_weather_region(query)
 
 # Global instance
 chatbot = None
+_chatbot_lock = threading.Lock()
 
 def get_chatbot() -> Chatbot:
     """Get global  chatbot instance"""
     global chatbot
-    if chatbot is None:
-        chatbot = Chatbot()
-    return chatbot
+    with _chatbot_lock:
+        if chatbot is None:
+            chatbot = Chatbot()
+        return chatbot
 
 
-def process_query(query: str, session_id: Optional[int] = None, stream: bool = False) -> str:
+def process_query(query: str, session_id: Optional[int] = None, stream: bool = False,
+                  skip_greeting: bool = False) -> str:
     """Process query using  chatbot"""
     chatbot = get_chatbot()
-    return chatbot.process_query(query, session_id, stream)
+    return chatbot.process_query(query, session_id, stream, skip_greeting=skip_greeting)
 
 
 def check_greeting(query: str) -> Optional[str]:
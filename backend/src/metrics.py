@@ -0,0 +1,139 @@
+"""Process-wide metrics registry (counters, histograms, gauges)"""
+import bisect
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Any
+
+# 기본 지연 시간 버킷 (초)
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _label_name(key: LabelKey) -> str:
+    return ",".join(f"{k}={v}" for k, v in key) or "total"
+
+
+class Counter:
+    """레이블별로 누적되는 카운터"""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "type": "counter",
+                "description": self.description,
+                "values": {_label_name(k): v for k, v in self._values.items()},
+            }
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus 방식의 le 버킷)"""
+
+    def __init__(self, name: str, description: str = "", buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._counts: List[int] = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            cumulative, buckets = 0, {}
+            for bound, count in zip(self.buckets + (float("inf"),), self._counts):
+                cumulative += count
+                buckets[f"le_{bound}"] = cumulative
+            return {
+                "type": "histogram",
+                "description": self.description,
+                "count": self._count,
+                "sum": self._sum,
+                "avg": self._sum / self._count if self._count else 0.0,
+                "buckets": buckets,
+            }
+
+
+class MetricsRegistry:
+    """이름별로 지표를 한 번만 만들고 스냅샷으로 내보내는 레지스트리"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Counter(name, description)
+            return self._metrics[name]
+
+    def histogram(self, name: str, description: str = "",
+                  buckets: Optional[Sequence[float]] = None) -> Histogram:
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(name, description, buckets or DEFAULT_LATENCY_BUCKETS)
+            return self._metrics[name]
+
+    def gauge(self, name: str, func: Callable[[], float], description: str = "") -> None:
+        """스냅샷 시점에 func()로 계산되는 값(예: 비율)을 등록합니다."""
+        with self._lock:
+            self._gauges[name] = (description, func)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = dict(self._metrics)
+            gauges = dict(self._gauges)
+        result = {name: metric.snapshot() for name, metric in metrics.items()}
+        for name, (description, func) in gauges.items():
+            try:
+                value = func()
+            except Exception:
+                value = None
+            result[name] = {"type": "gauge", "description": description, "value": value}
+        return result
+
+
+registry = MetricsRegistry()
+
+
+def counter(name: str, description: str = "") -> Counter:
+    return registry.counter(name, description)
+
+
+def histogram(name: str, description: str = "", buckets: Optional[Sequence[float]] = None) -> Histogram:
+    return registry.histogram(name, description, buckets)
+
+
+def gauge(name: str, func: Callable[[], float], description: str = "") -> None:
+    registry.gauge(name, func, description)
+
+
+def snapshot() -> Dict[str, Any]:
+    """현재 프로세스의 모든 지표를 dict로 반환합니다."""
+    return registry.snapshot()
@@ -1,16 +1,16 @@
-from langchain.prompts import PromptTemplate
-from langchain.chains.llm import LLMChain
 import vector_manger as vm 
 import os 
+import time
+import functools
 from datetime import date
 from langchain.tools import Tool
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
-from weather import get_weather
-from typing import List, Dict, Any, Optional
-from langchain.output_parsers import StructuredOutputParser, ResponseSchema, CommaSeparatedListOutputParser
+from typing import List, Dict, Any
 import logging
-import requests
+import prompts
+import metrics
+from query_rules import classify_query
 from naver_map_utils import NaverMapUtils
 
 #-------------- LOAD -----------------
@@ -37,6 +37,28 @@ def ensure_db_loaded():
     if db_place is None:
         db_place = get_db("faiss_place_kure")
 
+# LLM 클라이언트 재사용 (모델·temperature별로 하나씩, 스레드 간 공유)
+@functools.lru_cache(maxsize=None)
+def get_llm(model: str = 'gpt-4o-mini', temperature: float = 0) -> ChatOpenAI:
+    return ChatOpenAI(
+        model=model,
+        api_key=openai_api_key,
+        temperature=temperature
+    )
+
+# 카테고리 분류 경로별(rule: 규칙 기반 즉시 분류, llm: LLM 분류) 호출 수와 지연 시간
+_classifier_calls = metrics.counter('query_classifier_calls_total', '카테고리 분류 경로별 호출 수')
+_classifier_latency = {
+    path: metrics.histogram(f'query_classifier_{path}_latency_seconds', f'카테고리 분류 지연 시간 ({path})')
+    for path in ('rule', 'llm')
+}
+
+def _classifier_rule_hit_ratio() -> float:
+    rule, llm = _classifier_calls.get(path='rule'), _classifier_calls.get(path='llm')
+    return rule / (rule + llm) if rule + llm else 0.0
+
+metrics.gauge('query_classifier_rule_hit_ratio', _classifier_rule_hit_ratio, '규칙 기반으로 분류된 질의 비율')
+
 #------------------------------------- 
 
 def get_naver_map_link(place_name: str) -> str:
@@ -61,133 +83,42 @@ def get_category(query: str) -> List[str]:
     Returns:
         List[str]: List [카테고리]
     """
-    output_parser = CommaSeparatedListOutputParser()
-    format_instructions = output_parser.get_format_instructions()
+    # 명확한 질의는 규칙으로 바로 분류
+    started = time.perf_counter()
+    result = classify_query(query)
+    if result is not None:
+        _classifier_calls.inc(path='rule')
+        _classifier_latency['rule'].observe(time.perf_counter() - started)
+        return result
     
-    category_prompt = PromptTemplate.from_template(
-    """
-    질문을 보고 해당되는 카테고리를 모두 골라서 콤마(,)로 구분해서 작성해줘 (복수 선택 가능):
-    - 관광지
-    - 숙박
-    - 대중교통
-    - 날씨
-    
-    {format_instructions}
-    
-    질문: {input}
+    # 고정 지침·예시는 system, 질문만 human 메시지로 (프롬프트 캐시 재사용)
+    category_prompt = prompts.category_prompt()
+    output_parser = prompts.category_output_parser()
     
-    응답 예시: 
-    input: "강릉으로 여행 가려고하는데 날씨가 괜찮을까?"
-    output: 날씨
-    
-    input: "부산에서 기차나 버스에 반려견 태울 수 있어?"
-    output: 대중교통
-    
-    input: "이번 주말에 버스타고 속초 가서 하루 자고 오고 싶어. 강아지랑 같이 갈 수 있을까?"
-    output: 관광지, 숙박, 대중교통
-    """
-    )
-    
-    client = ChatOpenAI(
-        model='gpt-4o-mini',
-        api_key=openai_api_key,
-        temperature=0
-    )
+    client = get_llm('gpt-4o-mini', temperature=0)
     chain = category_prompt | client | output_parser
-    result = chain.invoke({"input": query, "format_instructions": format_instructions})
+    result = chain.invoke({"input": query})
+    _classifier_calls.inc(path='llm')
+    _classifier_latency['llm'].observe(time.perf_counter() - started)
     return result
 
 
 def get_user_parser(query : str) -> Dict[str, Any]:
     
-    user_parser_prompt = PromptTemplate.from_template("""
-    당신은 사용자의 여행 요청 문장에서 다음 3가지를 정확히 추출해야 합니다.
-    1. 여행 지역 이름 (예: 강릉, 제주도)
-    2. 반려동물 종류 (예: 강아지, 고양이 등)
-    3. 여행 일수
-    - "이번 달 말","이번 달","다음 주"는 날짜 기준이 아닌 경우는 숫자로 바꾸지 말고 그대로 문자열로 출력하세요.
-    - "주말"은 날짜 기준이 아닌 경우는 숫자로 바꾸지 말고 그대로 문자열로 출력하세요.
-    - "글피"처럼 날짜 기준이 아닌 경우는 숫자로 바꾸지 말고 그대로 문자열로 출력하세요.
-    - "당일치기"는 날짜 기준이 아닌 경우는 숫자로 바꾸지 말고 그대로 문자열로 출력하세요.
-    - 날짜 기준이 아닌 경우는 숫자로 바꾸지 말고 그대로 문자열로 출력하세요.
-    - 명확하지 않으면 "null"을 사용하세요.
-
-    출력 형식(JSON):
-    {format_instructions}
-
-    예시 입력 1:
-    제주도에 고양이랑 2박 3일 놀러 가려고 해
-    예시 출력 1:
-    {{"region": "제주도", "pet_type": "고양이", "days": 3}}
-
-    예시 입력 2:
-    강아지랑 강릉으로 다음 주에 여행 가고 싶어
-    예시 출력 2:
-    {{"region": "강릉", "pet_type": "강아지", "days": "다음 주"}}
-
-    예시 입력 3:
-    양양에 반려견 두 마리랑 모레부터 4일간 머물 곳 있을까?
-    예시 출력 3:
-    {{"region": "양양", "pet_type": "반려견", "days": 4}}
-
-    예시 입력 4:
-    이번 주말에 고양이랑 단양 여행 가면 어때?
-    예시 출력 4:
-    {{"region": "단양", "pet_type": "고양이", "days": "주말"}}
-
-    예시 입력 5:
-    글피에 강아지랑 속초로 여행 갈 건데
-    예시 출력 5:
-    {{"region": "속초", "pet_type": "강아지", "days": "글피"}}
-        
-    예시 입력 6:
-    이번 주에 수요일에 고양이랑 단양 여행 가면 어때?
-    예시 출력 6:
-    {{"region": "단양", "pet_type": "고양이", "days": "당일치기"}}
-
-    이제 아래 사용자 입력을 분석해 주세요:
-
-    입력:
-    {query}
-    """)
-
-    
-    #  스키마 정의 
-    response_schemas = [
-        ResponseSchema(name="region", description="여행 지역 이름"),
-        ResponseSchema(name= "pet_type", description ="반려동물 종류"),
-        ResponseSchema(name="days", description="여행 일수 (숫자만)")
-    ]
-    parser = StructuredOutputParser.from_response_schemas(response_schemas)
-    format_instructions = parser.get_format_instructions()
+    # 고정 지침·예시는 system, 입력만 human 메시지로 (프롬프트 캐시 재사용)
+    user_parser_prompt = prompts.user_parser_prompt()
+    parser = prompts.user_parser_output_parser()
     
     # chat_gpt 정의 
-    llm = ChatOpenAI(
-        model ='gpt-4o-mini', 
-        api_key=openai_api_key,
-        temperature= 0
-    )
+    llm = get_llm('gpt-4o-mini', temperature=0)
     
     chain = user_parser_prompt | llm | parser
-    output = chain.invoke({
-        "query" : query,
-        "format_instructions" : format_instructions
-    })
+    output = chain.invoke({"query" : query})
     return output
 
-# 네이버 지도 장소 유효성 확인 
+# 네이버 지도 장소 유효성 확인 (공유 커넥션 풀 + TTL 캐시)
 def is_valid_place(place_name: str) -> bool:
-    url = 'https://openapi.naver.com/v1/search/local.json'
-    params = {
-        'query' : place_name,
-    }
-    headers = {
-        'X-Naver-Client-Id' : os.getenv('NAVER_CLIENT_KEY'),
-        'X-Naver-Client-Secret' : os.getenv('NAVER_CLIENT_SECRET_KEY')
-    }
-    response = requests.get(url, params=params, headers=headers)
-    data = response.json()
-    return len(data['items']) > 0
+    return NaverMapUtils.is_valid_place(place_name)
 
 
 
@@ -1,11 +1,137 @@
 import os
+import json
+import time
+import functools
+import threading
 import urllib.parse
-import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import httpx
+
+import metrics
 
 # 향후 실제 데이터를 기반으로 장소를 선별할 예정으로 사전에 코드 작성 
 logger = logging.getLogger(__name__)
 
+# 추가 장소 ID 테이블 ({"장소명": "네이버 place ID"}, 없으면 기본 매핑만 사용)
+PLACE_IDS_PATH = Path(os.getenv(
+    "NAVER_PLACE_IDS_PATH",
+    Path(__file__).resolve().parent.parent / "data" / "naver_place_ids.json",
+))
+
+
+# 네이버 지역 검색 API 호출 설정 (URL은 로컬 스텁으로 바꿀 수 있음)
+NAVER_LOCAL_SEARCH_URL = os.getenv('NAVER_LOCAL_SEARCH_URL', 'https://openapi.naver.com/v1/search/local.json')
+NAVER_SEARCH_TIMEOUT = httpx.Timeout(3.0, connect=1.0)
+
+# 장소 유효성 일괄 검증 설정
+PLACE_VALIDATION_CONCURRENCY = 8    # 동시에 보내는 검색 요청 수
+PLACE_VALIDATION_DEADLINE = 5.0     # 일괄 검증 전체를 기다리는 최대 시간(초)
+PLACE_VALID_TTL = 7 * 24 * 60 * 60  # 존재하는 장소 결과 캐시: 7일
+PLACE_INVALID_TTL = 24 * 60 * 60    # 없는 장소 결과 캐시: 1일 (새로 등록될 수 있음)
+
+_validation_executor = ThreadPoolExecutor(max_workers=PLACE_VALIDATION_CONCURRENCY,
+                                          thread_name_prefix="place-validation")
+_validation_cache: Dict[str, Tuple[float, bool]] = {}
+_validation_cache_lock = threading.Lock()
+_validation_results = metrics.counter('naver_place_validation_total', '네이버 장소 유효성 검증 결과')
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+
+def _get_http_client() -> httpx.Client:
+    """keep-alive 커넥션 풀을 공유하는 네이버 API 클라이언트 (스레드 안전)"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                timeout=NAVER_SEARCH_TIMEOUT,
+                limits=httpx.Limits(max_connections=PLACE_VALIDATION_CONCURRENCY * 2,
+                                    max_keepalive_connections=PLACE_VALIDATION_CONCURRENCY),
+            )
+        return _http_client
+
+
+def close_http_client() -> None:
+    """공유 클라이언트의 커넥션을 정리합니다."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+
+def clear_validation_cache() -> None:
+    with _validation_cache_lock:
+        _validation_cache.clear()
+
+
+def _get_cached_validation(place_name: str) -> Optional[bool]:
+    with _validation_cache_lock:
+        entry = _validation_cache.get(place_name)
+        if entry is None:
+            return None
+        expires_at, is_valid = entry
+        if expires_at < time.monotonic():
+            del _validation_cache[place_name]
+            return None
+        return is_valid
+
+
+def _set_cached_validation(place_name: str, is_valid: bool) -> None:
+    ttl = PLACE_VALID_TTL if is_valid else PLACE_INVALID_TTL
+    with _validation_cache_lock:
+        _validation_cache[place_name] = (time.monotonic() + ttl, is_valid)
+
+
+def _search_place(place_name: str) -> Optional[bool]:
+    """
+    지역 검색 결과가 있으면 True, 없으면 False.
+    요청이 실패하면 None (캐시하지 않고 다음 호출에서 다시 시도)
+    """
+    try:
+        response = _get_http_client().get(
+            NAVER_LOCAL_SEARCH_URL,
+            params={'query': place_name, 'display': 1},  # 결과 개수 제한
+            headers={
+                'X-Naver-Client-Id': os.getenv('NAVER_CLIENT_KEY') or '',
+                'X-Naver-Client-Secret': os.getenv('NAVER_CLIENT_SECRET_KEY') or '',
+            },
+        )
+        if response.status_code != 200:
+            logger.warning(f"Naver API request failed: {response.status_code}")
+            _validation_results.inc(result='error')
+            return None
+        is_valid = len(response.json().get('items', [])) > 0
+    except Exception as e:
+        logger.error(f"Error validating place {place_name}: {str(e)}")
+        _validation_results.inc(result='error')
+        return None
+
+    _set_cached_validation(place_name, is_valid)
+    _validation_results.inc(result='valid' if is_valid else 'invalid')
+    return is_valid
+
+
+def _load_place_ids(path: Path) -> Dict[str, str]:
+    if not path.exists():
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return {str(name): str(place_id) for name, place_id in json.load(f).items()}
+    except Exception as e:
+        logger.warning(f"Failed to load Naver place IDs from {path}: {str(e)}")
+        return {}
+
+
+# 장소 이름이 들어 있는 metadata 키 (Tour API 문서는 title, 로컬 JSON으로 만든 DB는 facility_name)
+PLACE_NAME_KEYS = ("title", "facility_name")
+
+
 class NaverMapUtils:
     # 알려진 장소 ID 매핑
     PLACE_IDS = {
@@ -14,9 +140,11 @@ class NaverMapUtils:
         "속초중앙시장": "13545523",
         "설악산국립공원": "11491297",
         # 다른 장소들의 ID도 추가 가능
+        **_load_place_ids(PLACE_IDS_PATH),
     }
     
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def get_map_link(place_name: str) -> str:
         """
         네이버 지도 링크 생성
@@ -35,10 +163,110 @@ class NaverMapUtils:
             encoded_name = urllib.parse.quote(place_name)
             return f"https://map.naver.com/p/search/{encoded_name}"
     
+    @staticmethod
+    def place_name(metadata: Optional[Dict[str, Any]]) -> Optional[str]:
+        """metadata의 장소 이름 (PLACE_NAME_KEYS 순서로 처음 값이 있는 키, 없으면 None)"""
+        if not metadata:
+            return None
+        for key in PLACE_NAME_KEYS:
+            if metadata.get(key):
+                return metadata[key]
+        return None
+    
+    @staticmethod
+    def annotate_documents(documents: Iterable) -> int:
+        """
+        문서 metadata에 네이버 지도 링크(map_link)와 알려진 장소 ID(naver_place_id)를 미리 채움
+        
+        적재 시점과 DB 로드 시점에 호출해, 응답 생성 시에는 metadata만 읽도록 합니다.
+        이미 채워진 문서는 장소 ID 매핑이 바뀐 경우에만 다시 계산합니다.
+        
+        Args:
+            documents: 장소 이름(title 또는 facility_name)이 있는 metadata를 가진 Document들
+            
+        Returns:
+            int: 새로 채우거나 갱신한 문서 수
+        """
+        annotated = 0
+        for doc in documents:
+            metadata = doc.metadata
+            place_name = NaverMapUtils.place_name(metadata)
+            if not place_name:
+                continue
+            place_id = NaverMapUtils.PLACE_IDS.get(place_name)
+            if metadata.get("map_link") and metadata.get("naver_place_id") == place_id:
+                continue
+            metadata["map_link"] = NaverMapUtils.get_map_link(place_name)
+            if place_id:
+                metadata["naver_place_id"] = place_id
+            else:
+                metadata.pop("naver_place_id", None)
+            annotated += 1
+        return annotated
+    
+    @staticmethod
+    def validate_places(place_names: Iterable[str], deadline: float = PLACE_VALIDATION_DEADLINE) -> Dict[str, bool]:
+        """
+        여러 장소의 유효성을 한 번에 확인
+        
+        캐시에 있는 이름은 바로 채우고, 나머지는 공유 커넥션 풀로 동시에 조회합니다.
+        요청이 실패했거나 deadline 안에 끝나지 않은 장소는 False로 반환하고 캐시하지 않습니다.
+        
+        Args:
+            place_names: 검증할 장소 이름들 (중복은 한 번만 조회)
+            deadline (float): 전체 조회를 기다리는 최대 시간(초)
+            
+        Returns:
+            Dict[str, bool]: 장소 이름 → 유효 여부
+        """
+        results: Dict[str, bool] = {}
+        missing: List[str] = []
+        for place_name in dict.fromkeys(name for name in place_names if name):
+            cached = _get_cached_validation(place_name)
+            if cached is None:
+                missing.append(place_name)
+            else:
+                results[place_name] = cached
+        if results:
+            _validation_results.inc(len(results), result='cache_hit')
+        if not missing:
+            return results
+
+        futures = {_validation_executor.submit(_search_place, name): name for name in missing}
+        done, not_done = wait(futures, timeout=deadline)
+        for future in not_done:
+            future.cancel()
+        if not_done:
+            logger.warning(f"{len(not_done)} place validations did not finish within {deadline}s")
+            _validation_results.inc(len(not_done), result='timeout')
+        for future, place_name in futures.items():
+            results[place_name] = bool(future in done and future.result())
+        return results
+    
+    @staticmethod
+    def validate_documents(documents: Sequence[Any], deadline: float = PLACE_VALIDATION_DEADLINE) -> List[bool]:
+        """
+        검색 결과 전체의 장소 유효성 마스크 (장소 이름 기준, 한 번의 일괄 검증)
+        
+        Args:
+            documents: Document 또는 (Document, score) 검색 결과 리스트
+            deadline (float): 전체 조회를 기다리는 최대 시간(초)
+            
+        Returns:
+            List[bool]: documents와 같은 길이의 마스크 (장소 이름이 없으면 False)
+        """
+        names = []
+        for doc in documents:
+            if isinstance(doc, tuple) and doc:
+                doc = doc[0]
+            names.append(NaverMapUtils.place_name(getattr(doc, "metadata", None)))
+        validity = NaverMapUtils.validate_places(names, deadline=deadline)
+        return [bool(name) and validity.get(name, False) for name in names]
+    
     @staticmethod
     def is_valid_place(place_name: str) -> bool:
         """
-        네이버 지도 API를 통해 장소 유효성 확인
+        네이버 지도 API를 통해 장소 유효성 확인 (결과는 TTL 동안 캐시)
         
         Args:
             place_name (str): 검증할 장소 이름
@@ -46,25 +274,4 @@ class NaverMapUtils:
         Returns:
             bool: 유효한 장소면 True, 아니면 False
         """
-        try:
-            url = 'https://openapi.naver.com/v1/search/local.json'
-            params = {
-                'query': place_name,
-                'display': 1  # 결과 개수 제한
-            }
-            headers = {
-                'X-Naver-Client-Id': os.getenv('NAVER_CLIENT_KEY'),
-                'X-Naver-Client-Secret': os.getenv('NAVER_CLIENT_SECRET_KEY')
-            }
-            
-            response = requests.get(url, params=params, headers=headers)
-            if response.status_code != 200:
-                logger.warning(f"Naver API request failed: {response.status_code}")
-                return False
-                
-            data = response.json()
-            return len(data.get('items', [])) > 0
-            
-        except Exception as e:
-            logger.error(f"Error validating place {place_name}: {str(e)}")
-            return False 
\ No newline at end of file
+        return NaverMapUtils.validate_places([place_name]).get(place_name, False)
@@ -0,0 +1,96 @@
+"""
+키워드·정규식 기반 질의 분류기.
+
+"서울 날씨", "KTX 반려견 탑승"처럼 한 카테고리로 명확한 질의는 LLM 호출 없이 바로 분류하고,
+여러 카테고리에 걸치거나 여행 일정처럼 판단이 필요한 질의는 None을 반환해 LLM에 맡깁니다.
+"""
+import re
+from typing import Dict, List, Optional
+
+from keyword_matcher import KeywordMatcher
+
+# 인사말 (영문은 단어 경계 기준으로 매칭)
+GREETING_KEYWORDS = ["안녕", "안녕하세요", "hello", "hi"]
+
+# 대중교통 수단별 키워드 (영문은 소문자로 비교)
+TRANSPORT_KEYWORDS: Dict[str, List[str]] = {
+    "기차": ["기차", "ktx", "srt", "itx", "열차", "철도", "korail", "코레일"],
+    "버스": ["버스", "시내버스", "시외버스", "고속버스"],
+    "지하철": ["지하철", "전철", "metro"],
+    "택시": ["택시", "call", "콜택시"],
+}
+
+# 카테고리별 명확한 신호 키워드
+CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    # "온도", "습도" 등은 "강아지 적정 온도"처럼 날씨가 아닌 질의에도 흔해서 LLM 판단에 맡김
+    "날씨": ["날씨", "일기예보"],
+    "대중교통": ["대중교통", "탑승", "승차"] + [kw for kws in TRANSPORT_KEYWORDS.values() for kw in kws],
+    "숙박": ["숙소", "숙박", "호텔", "펜션", "리조트", "모텔", "게스트하우스", "글램핑", "캠핑장",
+             "민박", "풀빌라", "묵을"],
+    "관광지": ["관광지", "관광", "명소", "가볼만한", "가볼 만한", "볼거리", "놀거리", "산책",
+              "공원", "해수욕장", "해변", "카페", "맛집", "식당"],
+}
+
+# 여행 일정처럼 여러 카테고리를 함께 판단해야 하는 신호 → 항상 LLM으로
+PLANNING_PATTERN = re.compile(r"여행|일정|코스|휴가|주말|놀러|하룻밤|자고 오|머물|\d+\s*박|\d+\s*일간|당일치기")
+
+# 날씨 질의에서 지역명을 뽑는 패턴 (지역명이 날씨 키워드 앞에 오는 경우 우선)
+WEATHER_REGION_STOPWORDS = {"날씨", "기온", "온도", "비", "눈", "바람", "습도", "맑", "흐림",
+                            "현재", "지금", "오늘", "내일", "어때", "일기예보"}
+WEATHER_QUERY_KEYWORDS = ("날씨", "기온", "온도", "일기예보")
+WEATHER_REGION_PATTERNS = [
+    re.compile(r'([가-힣]+(?:시|구|군|도))\s*(?:의\s*)?(?:날씨|기온|온도|현재)'),  # 서울시 날씨, 강남구 날씨
+    re.compile(r'([가-힣]+)\s*(?:의\s*)?(?:날씨|기온|온도)'),      # 서울 날씨, 서울의 날씨
+    re.compile(r'([가-힣]+)\s+(?:현재|지금)'),                    # 서울 현재, 부산 지금
+]
+_HANGUL_WORD = re.compile(r'[가-힣]+')
+
+# 미리 컴파일한 매처 (모듈 로드 시 한 번)
+_greeting_matcher = KeywordMatcher(GREETING_KEYWORDS)
+_category_matcher = KeywordMatcher(
+    {keyword: category for category, keywords in CATEGORY_KEYWORDS.items() for keyword in keywords}
+)
+_weather_query_matcher = KeywordMatcher(WEATHER_QUERY_KEYWORDS)
+
+
+def is_greeting(query: str) -> bool:
+    """인사말이 들어 있는 질의인지"""
+    return _greeting_matcher.search(query)
+
+
+def match_categories(query: str) -> List[str]:
+    """질의에 신호 키워드가 있는 카테고리 목록 (CATEGORY_KEYWORDS 순서)"""
+    matched = set(_category_matcher.labels(query))
+    return [category for category in CATEGORY_KEYWORDS if category in matched]
+
+
+def classify_query(query: str) -> Optional[List[str]]:
+    """
+    명확한 질의의 카테고리를 규칙으로 판단합니다.
+    정확히 한 카테고리의 키워드만 있고 여행 일정 신호가 없을 때만 [카테고리]를 반환하고,
+    그 밖에는 None (LLM 분류 필요)
+    """
+    if not query or PLANNING_PATTERN.search(query):
+        return None
+    matched = match_categories(query)
+    return matched if len(matched) == 1 else None
+
+
+def extract_weather_region(query: str) -> Optional[str]:
+    """날씨 질의에서 지역명을 추출합니다. 날씨 질의가 아니면 None"""
+    if not _weather_query_matcher.search(query):
+        return None
+
+    for pattern in WEATHER_REGION_PATTERNS:
+        match = pattern.search(query)
+        if match:
+            candidate = match.group(1)
+            if candidate not in WEATHER_REGION_STOPWORDS:
+                return candidate
+
+    # Fallback: 날씨 키워드가 아닌 첫 번째 두 글자 이상 한글 단어
+    for word in _HANGUL_WORD.findall(query):
+        if word not in WEATHER_REGION_STOPWORDS and len(word) >= 2:
+            return word
+
+    return None
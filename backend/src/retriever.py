@@ -1,21 +1,27 @@
 import logging
 import traceback
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Any
 from langchain.schema import Document
-from langchain_openai import ChatOpenAI
-from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-import json
 import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
 from dotenv import load_dotenv
 
 # Import existing modules
 import vector_manger as vm
-from module import get_category, get_user_parser, get_naver_map_link
-from fetch_pt_places import fetch_pet_friendly_places_only
+from module import get_category, get_user_parser, get_naver_map_link, get_llm
+from fetch_pt_places import fetch_pet_friendly_places_only, match_region_to_codes, CONTENT_TYPE_IDS
 from weather import get_weather, get_current_time
-from vectordb_updater import VectorDBUpdater
+from vectordb_updater import get_db_updater
+from naver_map_utils import NaverMapUtils
+from single_flight import SingleFlight
+import metrics
+import prompts
+from weather_answer import answer_weather_query
+from context_builder import pack_documents, record_prompt_tokens
 
 # Load environment variables
 load_dotenv()
@@ -25,38 +31,53 @@ openai_api_key = os.getenv('OPENAI_API_KEY')
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 같은 (카테고리, 시/도 코드, 시군구 코드, 조회 개수)에 대한 동시 외부 조회를 하나로 합침
+_external_fetch_flight = SingleFlight()
+_coalesced_calls = metrics.counter('tour_api_coalesced_calls_total', '진행 중인 외부 조회 결과를 공유받은 호출 수')
+
+# 추측 생성: 로컬 결과로 먼저 답하고, 외부 보강 결과는 예산 안에 도착하면 "최신 정보"로 덧붙임
+SPECULATIVE_GENERATION = os.getenv('RETRIEVER_SPECULATIVE_GENERATION', '0') == '1'
+ADDENDUM_BUDGET = float(os.getenv('RETRIEVER_ADDENDUM_BUDGET', '2.0'))  # 외부 보강 시작부터 기다리는 최대 시간(초)
+_augment_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="retriever-augment")
+_addendum_results = metrics.counter('retriever_addendum_total', '추측 생성 시 최신 정보 덧붙임 결과')
+
 class Retriever:
     """
     Enhanced retrieval system with automatic category routing and dynamic VectorDB augmentation
+    
+    Instances hold no per-query state, so one instance (see get_retriever) is shared
+    across threads. LLM clients and the VectorDB updater are process-wide singletons.
     """
     
     def __init__(self, 
                 min_results_threshold: int = 3,
                 quality_threshold: float = 0.7,
                 max_external_results: int = 30,  # 최대 외부 API fetch 개수 넉넉히
-                enable_db_updates: bool = True):
+                enable_db_updates: bool = True,
+                speculative: bool = SPECULATIVE_GENERATION,
+                addendum_budget: float = ADDENDUM_BUDGET):
         """
         Initialize the enhanced retriever
         
         Args:
             min_results_threshold: Minimum number of results required before external API call
-            quality_threshold: Minimum similarity score for considering results as high quality
+            quality_threshold: Minimum cosine similarity (relevance_score) for considering results as high quality
             max_external_results: Maximum number of results to fetch from external APIs
             enable_db_updates: Whether to save new data to VectorDB
+            speculative: Answer from local results first and fetch external data concurrently
+            addendum_budget: Seconds external data may take (from fetch start) to still be appended
         """
         self.min_results_threshold = min_results_threshold
         self.quality_threshold = quality_threshold
         self.max_external_results = max_external_results
         self.enable_db_updates = enable_db_updates
+        self.speculative = speculative
+        self.addendum_budget = addendum_budget
         
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            api_key=openai_api_key,
-            temperature=0.3
-        )
+        self.llm = get_llm("gpt-4o-mini", temperature=0.3)
         
-        # Initialize VectorDB updater if updates are enabled
-        self.db_updater = VectorDBUpdater() if enable_db_updates else None
+        # Shared VectorDB updater if updates are enabled
+        self.db_updater = get_db_updater() if enable_db_updates else None
         
         # Category to external API mapping
         self.external_api_mapping = {
@@ -74,13 +95,14 @@ class Retriever:
             days = 1
         return days * 4
 
-    def process_query(self, query: str, stream: bool = False) -> str:
+    def process_query(self, query: str, stream: bool = False, speculative: Optional[bool] = None) -> str:
         """
         Main processing pipeline for user queries
         
         Args:
             query: User input query
             stream: Whether to stream the response
+            speculative: Override self.speculative for this query
             
         Returns:
             Generated response or stream generator
@@ -88,6 +110,11 @@ class Retriever:
         try:
             logger.info(f"Processing query: {query}")
             
+            # Step 0: Weather-only queries are answered locally (no retrieval, no LLM)
+            weather_answer = answer_weather_query(query)
+            if weather_answer:
+                return iter([weather_answer]) if stream else weather_answer
+            
             # Step 1: Query Analysis
             categories = self._analyze_query_categories(query)
             user_parsed = self._parse_user_info(query)
@@ -99,11 +126,18 @@ class Retriever:
             days = user_parsed.get("days", 1)
             total_needed = self.get_total_needed_places(days)
             
-            # Step 2: Initial VectorDB Search (동적으로 개수 조정)
-            initial_results = self._search_vector_db(query, categories, k_each=total_needed, top_k=total_needed)
+            # Step 2: Initial VectorDB Search (후보를 넉넉히 뽑고 관련도가 급격히 떨어지는 지점에서 자름)
+            initial_results = self._search_vector_db(query, categories, k_each=total_needed * 2, top_k=total_needed)
             
             # Step 3: Result Quality Assessment
-            quality_assessment = self._assess_result_quality(initial_results, categories, total_needed)
+            quality_assessment = self._assess_result_quality(initial_results, categories, total_needed, user_parsed)
+            
+            # Step 4 (speculative): answer from local results while external data is fetched
+            speculative = self.speculative if speculative is None else speculative
+            if speculative and self._should_speculate(categories, initial_results, quality_assessment):
+                return self._generate_speculative_response(
+                    query, user_parsed, categories, initial_results, quality_assessment, total_needed, stream
+                )
             
             # Step 4: Dynamic Augmentation if needed (total_needed 전달)
             final_results = self._augment_results_if_needed(
@@ -134,27 +168,54 @@ class Retriever:
             return {"region": None, "pet_type": None, "days": None}
     
     def _search_vector_db(self, query: str, categories: List[str], k_each: int = 5, top_k: int = 5) -> Dict[str, List[Document]]:
-        """Search vector database for each category"""
+        """Search vector database for each category, keeping only the relevant prefix of the candidates"""
         try:
             return vm.multiretrieve_by_category(
                 query=query,
                 categories=categories,
                 k_each=k_each,
-                top_k=top_k
+                top_k=top_k,
+                adaptive=True,
+                min_k=min(self.min_results_threshold, top_k)
             )
         except Exception as e:
             logger.error(f"Error searching vector DB: {str(e)}")
             return {}
     
+    @staticmethod
+    def _matches_region(doc: Document, region: str) -> bool:
+        """Whether a document's address fields (or content) mention the requested region"""
+        region = region.strip()
+        # '강릉시' → '강릉' 처럼 행정구역 접미사를 떼고 비교
+        key = region[:-1] if len(region) > 2 and region[-1] in "시군구도" else region
+        metadata = doc.metadata or {}
+        location = " ".join(
+            str(metadata.get(field, ""))
+            for field in ("province", "city", "road_address", "addr1", "addr2", "address")
+        )
+        return key in location or key in doc.page_content
+
     def _assess_result_quality(self, results: Dict[str, List[Document]], 
-                                categories: List[str], total_needed: int) -> Dict[str, Dict[str, Any]]:
+                                categories: List[str], total_needed: int,
+                                user_parsed: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
         """
         Assess the quality and sufficiency of search results
         
+        A result counts as high quality when its relevance_score (attached by
+        multiretrieve_by_category) reaches quality_threshold and, if the user named a
+        region, the result is located there.
+        
+        Sufficiency is judged on high-quality results only: the adaptive cutoff in
+        _search_vector_db deliberately returns fewer than total_needed documents for
+        narrow queries, so a short result list alone does not trigger augmentation.
+        
         Returns:
             Dict with quality assessment for each category
         """
         assessment = {}
+        region = (user_parsed or {}).get("region")
+        if not isinstance(region, str) or not region.strip() or region == "null":
+            region = None
         
         for category in categories:
             if category == "날씨":
@@ -163,21 +224,32 @@ class Retriever:
             category_results = results.get(category, [])
             result_count = len(category_results)
             
-            # Assess quantity
-            sufficient_quantity = result_count >= total_needed
+            # Assess quality by similarity score
+            scores = [doc.metadata.get("relevance_score") for doc in category_results]
+            scores = [score for score in scores if score is not None]
+            avg_score = sum(scores) / len(scores) if scores else 0.0
             
-            # Assess quality (simple heuristic - can be improved)
-            avg_content_length = 0
-            if category_results:
-                avg_content_length = sum(len(doc.page_content) for doc in category_results) / len(category_results)
+            # Assess region match
+            if region and category_results:
+                region_matches = [self._matches_region(doc, region) for doc in category_results]
+                region_match_ratio = sum(region_matches) / len(region_matches)
+            else:
+                region_matches = [True] * result_count
+                region_match_ratio = 1.0
             
-            sufficient_quality = avg_content_length > 50  # Minimum content length
+            high_quality_count = sum(
+                1 for doc, in_region in zip(category_results, region_matches)
+                if in_region and doc.metadata.get("relevance_score", 0.0) >= self.quality_threshold
+            )
+            sufficient_quality = high_quality_count >= min(total_needed, self.min_results_threshold)
             
             assessment[category] = {
                 "result_count": result_count,
-                "sufficient_quantity": sufficient_quantity,
+                "avg_score": round(avg_score, 4),
+                "region_match_ratio": round(region_match_ratio, 4),
+                "high_quality_count": high_quality_count,
                 "sufficient_quality": sufficient_quality,
-                "needs_augmentation": not (sufficient_quantity and sufficient_quality)
+                "needs_augmentation": not sufficient_quality
             }
             
             logger.info(f"Quality assessment for {category}: {assessment[category]}")
@@ -203,29 +275,29 @@ class Retriever:
             # 중복 체크용 title/contentid set
             existing_titles = set(doc.metadata.get("title") for doc in existing_docs if doc.metadata.get("title"))
             existing_ids = set(doc.metadata.get("contentid") for doc in existing_docs if doc.metadata.get("contentid"))
-            shortfall = total_needed - len(existing_docs)
+            # 점수·지역 기준을 통과한 결과만 충족한 것으로 보고 모자란 만큼 외부에서 보강
+            shortfall = total_needed - assessment.get("high_quality_count", len(existing_docs))
             if assessment.get("needs_augmentation", False) and shortfall > 0:
                 logger.info(f"Augmenting results for category: {category}")
                 
+                # 중복 제거 (title 또는 contentid 기준) - 부족한 개수만큼 모이면 페이지 조회 중단
+                def is_new(item: Dict[str, Any]) -> bool:
+                    return bool(
+                        (item.get("contentid") and item.get("contentid") not in existing_ids) or
+                        (item.get("title") and item.get("title") not in existing_titles)
+                    )
+                
                 # Fetch external data
-                external_data = self._fetch_external_data(category, user_parsed)
+                unique_external, shared = self._fetch_external_data(category, user_parsed, shortfall, is_new)
                 
-                if external_data:
-                    # 중복 제거 (title 또는 contentid 기준)
-                    unique_external = [
-                        item for item in external_data
-                        if (
-                            (item.get("contentid") and item.get("contentid") not in existing_ids) or
-                            (item.get("title") and item.get("title") not in existing_titles)
-                        )
-                    ][:shortfall]
+                if unique_external:
                     external_docs = self._convert_to_documents(unique_external, category)
                     
-                    # Add to VectorDB for future use if enabled
-                    if self.enable_db_updates and self.db_updater and unique_external:
+                    # Add to VectorDB for future use if enabled (공유받은 결과는 leader가 이미 큐에 넣음)
+                    if self.enable_db_updates and self.db_updater and not shared:
                         try:
                             db_docs = self.db_updater.create_documents_from_api_data(unique_external, category, query)
-                            self.db_updater.add_documents_to_db(db_docs, category)
+                            self.db_updater.enqueue_documents(db_docs, category)
                         except Exception as e:
                             logger.error(f"Error updating VectorDB: {str(e)}")
                     
@@ -236,39 +308,132 @@ class Retriever:
         
         return final_results
     
-    def _fetch_external_data(self, category: str, user_parsed: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Fetch data from external APIs based on category"""
-        if category in self.external_api_mapping:
-            try:
-                return self.external_api_mapping[category](user_parsed)
-            except Exception as e:
-                logger.error(f"Error fetching external data for {category}: {str(e)}")
-                return []
-        return []
+    def _should_speculate(self, categories: List[str], initial_results: Dict[str, List[Document]],
+                          quality_assessment: Dict[str, Dict[str, Any]]) -> bool:
+        """Speculate only when an external fetch would run and there are local results to answer from"""
+        needs_external = any(
+            quality_assessment.get(category, {}).get("needs_augmentation", False)
+            for category in categories if category in self.external_api_mapping
+        )
+        return needs_external and any(initial_results.get(category) for category in categories)
+    
+    def _generate_speculative_response(self, query: str, user_parsed: Dict[str, Any], categories: List[str],
+                                       initial_results: Dict[str, List[Document]],
+                                       quality_assessment: Dict[str, Dict[str, Any]],
+                                       total_needed: int, stream: bool):
+        """
+        Generate the answer from local results while external augmentation runs in the background
+        
+        External places that arrive within addendum_budget are appended as a locally rendered
+        "최신 정보" section. Late results are not shown but still reach the VectorDB queue.
+        """
+        # 외부 보강은 백그라운드에서 (날씨는 빠르고 캐시되므로 여기서 바로 채움)
+        fetch_categories = [category for category in categories if category != "날씨"]
+        deadline = time.monotonic() + self.addendum_budget
+        future = _augment_executor.submit(
+            self._augment_results_if_needed,
+            query, user_parsed, fetch_categories, initial_results, quality_assessment, total_needed
+        )
+        
+        local_results = dict(initial_results)
+        if "날씨" in categories:
+            local_results["날씨"] = self._get_weather_info(user_parsed.get("region"))
+        
+        response = self._generate_response(query, user_parsed, local_results, stream)
+        if stream:
+            return self._stream_with_addendum(response, future, deadline, initial_results)
+        return response + self._await_addendum(future, deadline, initial_results)
     
-    def _fetch_tourist_attractions(self, user_parsed: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Fetch tourist attractions from external API"""
+    def _stream_with_addendum(self, response: Iterator[str], future: "Future[Dict[str, List[Document]]]",
+                              deadline: float, initial_results: Dict[str, List[Document]]) -> Iterator[str]:
+        yield from response
+        addendum = self._await_addendum(future, deadline, initial_results)
+        if addendum:
+            yield addendum
+    
+    def _await_addendum(self, future: "Future[Dict[str, List[Document]]]", deadline: float,
+                        initial_results: Dict[str, List[Document]]) -> str:
+        """
+        Wait for the background augmentation until the deadline and render the places it added
+        
+        Only documents that were not in initial_results are rendered: local FAISS documents
+        written by the sync job or write queue also carry data_source='external_api'.
+        """
+        try:
+            augmented = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            _addendum_results.inc(result="late")
+            logger.info("External augmentation missed the addendum budget; answered from local results only")
+            return ""
+        except Exception as e:
+            _addendum_results.inc(result="error")
+            logger.error(f"Error in background augmentation: {str(e)}")
+            return ""
+        
+        local_ids = {id(doc) for docs in initial_results.values() for doc in docs}
+        fetched = {
+            category: [doc for doc in docs if id(doc) not in local_ids]
+            for category, docs in augmented.items()
+        }
+        addendum = render_addendum({category: docs for category, docs in fetched.items() if docs})
+        _addendum_results.inc(result="included" if addendum else "empty")
+        return addendum
+    
+    def _fetch_external_data(self, category: str, user_parsed: Dict[str, Any], limit: int,
+                             predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Fetch up to `limit` items passing `predicate` from external APIs based on category
+        
+        Concurrent calls for the same (category, area_code, sigungu_code, limit) share one fetch;
+        limit is part of the key so a caller is never joined to a smaller fetch than it needs.
+        
+        Returns:
+            (items, shared) - shared is True when the items came from another caller's fetch
+        """
+        if category not in self.external_api_mapping:
+            return [], False
+        limit = min(limit, self.max_external_results)
+        try:
+            region = user_parsed.get("region")
+            area_code, sigungu_code = match_region_to_codes(region) if region else (None, None)
+            items, shared = _external_fetch_flight.do(
+                (category, area_code, sigungu_code, limit),
+                lambda: self.external_api_mapping[category](user_parsed, limit, predicate),
+            )
+            if shared:
+                _coalesced_calls.inc(category=category)
+                # 다른 호출자의 조건으로 가져온 결과이므로 내 기준으로 다시 거름
+                items = [item for item in items if predicate is None or predicate(item)][:limit]
+            # 원본은 여러 호출자가 공유하므로 복사본을 수정하도록 함
+            return [dict(item) for item in items], shared
+        except Exception as e:
+            logger.error(f"Error fetching external data for {category}: {str(e)}")
+            return [], False
+    
+    def _fetch_tourist_attractions(self, user_parsed: Dict[str, Any], limit: int,
+                                   predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+        """Fetch tourist attractions (contentTypeId=12) from external API"""
         try:
             if user_parsed.get("region"):
-                results = fetch_pet_friendly_places_only(user_parsed, limit=self.max_external_results)
+                results = fetch_pet_friendly_places_only(user_parsed, limit=limit,
+                                                         content_type_id=CONTENT_TYPE_IDS["관광지"],
+                                                         predicate=predicate)
                 logger.info(f"Fetched {len(results)} tourist attractions from external API")
                 return results
         except Exception as e:
             logger.error(f"Error fetching tourist attractions: {str(e)}")
         return []
     
-    def _fetch_accommodations(self, user_parsed: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Fetch accommodation data from external API"""
-        # This can be implemented with another API
-        # For now, using the same API as tourist attractions
+    def _fetch_accommodations(self, user_parsed: Dict[str, Any], limit: int,
+                              predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+        """Fetch accommodations (contentTypeId=32) from external API"""
         try:
             if user_parsed.get("region"):
-                results = fetch_pet_friendly_places_only(user_parsed, limit=self.max_external_results)
-                # Filter for accommodations if possible
-                accommodations = [r for r in results if any(keyword in r.get('title', '').lower() 
-                                                        for keyword in ['호텔', '펜션', '리조트', '게스트하우스', '숙박'])]
-                logger.info(f"Fetched {len(accommodations)} accommodations from external API")
-                return accommodations
+                results = fetch_pet_friendly_places_only(user_parsed, limit=limit,
+                                                         content_type_id=CONTENT_TYPE_IDS["숙박"],
+                                                         predicate=predicate)
+                logger.info(f"Fetched {len(results)} accommodations from external API")
+                return results
         except Exception as e:
             logger.error(f"Error fetching accommodations: {str(e)}")
         return []
@@ -317,13 +482,15 @@ class Retriever:
             
             content = "\n".join(content_parts)
             
-            # Add source information
-            item['data_source'] = 'external_api'
-            item['fetch_time'] = datetime.now().isoformat()
-            item['category'] = category
+            # Add source information (copy: the same items are later passed to create_documents_from_api_data)
+            metadata = dict(item)
+            metadata['data_source'] = 'external_api'
+            metadata['fetch_time'] = datetime.now().isoformat()
+            metadata['category'] = category
             
-            documents.append(Document(page_content=content, metadata=item))
+            documents.append(Document(page_content=content, metadata=metadata))
         
+        NaverMapUtils.annotate_documents(documents)
         return documents
     
     def _generate_response(self, query: str, user_parsed: Dict[str, Any], 
@@ -331,58 +498,27 @@ class Retriever:
         """Generate final response using LLM"""
         
         # Prepare content sections
-        content_sections = []
-        
-        for category, docs in results.items():
-            if not docs:
-                continue
-                
-            category_content = f"### {category} 정보\n"
+        def render(i: int, doc: Document, body: str) -> str:
+            metadata = doc.metadata
             
-            for i, doc in enumerate(docs, 1):
-                metadata = doc.metadata
-                
-                # Generate map link
-                place_name = metadata.get("title", f"장소 {i}")
-                map_link = get_naver_map_link(place_name) if place_name != f"장소 {i}" else "#"
-                
-                place_info = f"**{i}. [{place_name}]({map_link})**\n"
-                place_info += doc.page_content
-                
-                if metadata.get('data_source') == 'external_api':
-                    place_info += "\n   *(최신 정보)*"
-                
-                place_info += "\n\n"
-                category_content += place_info
+            # Map link precomputed at ingestion/load time
+            place_name = NaverMapUtils.place_name(metadata)
+            map_link = metadata.get("map_link") or (get_naver_map_link(place_name) if place_name else "#")
+            place_name = place_name or f"장소 {i}"
             
-            content_sections.append(category_content)
-        
-        content = "\n".join(content_sections)
-        
-        # Generate final response using LLM
-        template = """
-        당신은 반려동물과 함께하는 여행 전문 도우미입니다. 
-        사용자의 질문에 대해 제공된 실제 데이터를 바탕으로 친절하고 유용한 답변을 제공해주세요.
-        
-        **중요 지침:**
-        1. 제공된 데이터만을 사용하여 답변하세요
-        2. 마크다운 형식으로 정리해서 응답하세요
-        3. 각 장소의 네이버 지도 링크를 포함하세요
-        4. 반려동물 관련 정보가 있다면 강조해서 안내하세요
-        5. 여행 일정이나 코스 추천이 가능하다면 제안해주세요
-        
-        사용자 질문: {query}
-        지역: {region}
-        반려동물: {pet_type}
-        여행 기간: {days}
-        
-        제공된 정보:
-        {content}
+            place_info = f"**{i}. [{place_name}]({map_link})**\n"
+            place_info += body
+            
+            if metadata.get('data_source') == 'external_api':
+                place_info += "\n   *(최신 정보)*"
+            
+            return place_info + "\n\n"
         
-        위 정보를 바탕으로 친절하고 상세한 답변을 제공해주세요:
-        """
+        # 토큰 예산 안에서 점수 높은 문서부터 채움 (외부 API 문서는 점수가 없어 우선 포함)
+        content, _ = pack_documents(results, render, header=lambda category: f"### {category} 정보\n")
         
-        prompt = PromptTemplate.from_template(template)
+        # Generate final response using LLM (static system prefix + per-request user message)
+        prompt = prompts.retriever_response_prompt()
         inputs = {
             "query": query,
             "region": user_parsed.get("region", "정보 없음"),
@@ -390,6 +526,7 @@ class Retriever:
             "days": user_parsed.get("days", "정보 없음"),
             "content": content or "관련 정보를 찾을 수 없습니다."
         }
+        record_prompt_tokens(prompt.format(**inputs), "retriever")
         
         chain = prompt | self.llm | StrOutputParser()
         
@@ -398,21 +535,76 @@ class Retriever:
         else:
             return chain.invoke(inputs)
 
+    def close(self):
+        """Wait for queued VectorDB writes before shutting down"""
+        if self.db_updater:
+            self.db_updater.flush()
+
+
+def render_addendum(results: Dict[str, List[Document]]) -> str:
+    """
+    외부 API로 새로 찾은 장소를 "최신 정보" 섹션으로 렌더링 (LLM 없이 metadata만 사용)
+    
+    Args:
+        results: 카테고리 → 외부 API 문서 리스트
+        
+    Returns:
+        마크다운 섹션 (새 장소가 없으면 빈 문자열)
+    """
+    if not results:
+        return ""
+    
+    sections = ["\n\n---\n## 🆕 최신 정보\n관광 API에서 방금 확인한 반려동물 동반 장소도 함께 알려드려요.\n"]
+    for category, docs in results.items():
+        sections.append(f"### {category}")
+        for i, doc in enumerate(docs, 1):
+            metadata = doc.metadata
+            place_name = NaverMapUtils.place_name(metadata)
+            map_link = metadata.get("map_link") or (get_naver_map_link(place_name) if place_name else "#")
+            place_name = place_name or f"장소 {i}"
+            lines = [f"**{i}. [{place_name}]({map_link})**"]
+            for label, key in (("주소", "addr1"), ("연락처", "tel"), ("반려동물 동반", "pet_info")):
+                if metadata.get(key):
+                    lines.append(f"   - {label}: {metadata[key]}")
+            sections.append("\n".join(lines))
+    return "\n\n".join(sections)
+
+
+# Global instance
+_retriever: Optional[Retriever] = None
+_retriever_lock = threading.Lock()
+
+def get_retriever() -> Retriever:
+    """Get the shared Retriever instance, creating it on first use"""
+    global _retriever
+    with _retriever_lock:
+        if _retriever is None:
+            _retriever = Retriever()
+        return _retriever
+
+def shutdown_retriever():
+    """Release the shared Retriever (flushes pending VectorDB writes)"""
+    global _retriever
+    with _retriever_lock:
+        retriever, _retriever = _retriever, None
+    if retriever is not None:
+        retriever.close()
+
 
 # Convenience functions for backward compatibility
-def process_query(query: str, stream: bool = False) -> str:
+def process_query(query: str, stream: bool = False, speculative: Optional[bool] = None) -> str:
     """
     Process query using the enhanced retriever system
     
     Args:
         query: User input query
         stream: Whether to stream the response
+        speculative: Answer from local results first (None: RETRIEVER_SPECULATIVE_GENERATION)
         
     Returns:
         Generated response
     """
-    retriever = Retriever()
-    return retriever.process_query(query, stream)
+    return get_retriever().process_query(query, stream, speculative=speculative)
 
 
 # # Example usage and testing
@@ -424,7 +616,7 @@ if __name__ == "__main__":
         "제주도 반려견과 1일 여행지 알려줘",             # days=1
         "강릉에서 2박 3일 강아지랑 여행 코스 짜줘"      # days=3
     ]
-    retriever = Retriever()
+    retriever = get_retriever()
     for query in test_queries:
         print(f"\n{'='*50}")
         print(f"Query: {query}")
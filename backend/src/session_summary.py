@@ -0,0 +1,102 @@
+"""
+대화 세션의 누적 요약(sessions.summary)을 응답 경로 밖에서 갱신합니다.
+
+매 턴이 끝나면 (이전 요약 + 이번 질문/답변)으로 새 요약을 만들어 저장하고, 생성 시에는
+긴 대화 원문 대신 이 요약만 프롬프트에 넣어 세션이 길어져도 프롬프트 크기가 일정하게 유지됩니다.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from langchain.prompts import PromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+
+import metrics
+from context_builder import truncate_to_tokens
+from module import get_llm
+from app.models.db import SessionLocal
+from app.models.chat import Session as ChatSession
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_WORKERS = int(os.getenv('SESSION_SUMMARY_WORKERS', '2'))
+SUMMARY_TOKEN_LIMIT = 300        # 저장되는 요약 길이 상한
+TURN_MESSAGE_TOKEN_LIMIT = 600   # 요약에 넣는 질문/답변 하나의 길이 상한
+
+SUMMARY_TEMPLATE = """
+당신은 반려동물 여행 상담 대화를 요약하는 도우미입니다.
+기존 요약에 이번 대화를 반영해 새 요약을 작성하세요.
+
+- 사용자의 여행 지역, 일정, 반려동물 정보, 선호·제약 조건을 우선 유지하세요.
+- 추천된 장소·숙소 이름은 남기되 설명은 생략하세요.
+- 5문장 이내의 평문으로, 요약만 출력하세요.
+
+기존 요약:
+{summary}
+
+이번 사용자 질문:
+{user_message}
+
+이번 챗봇 답변:
+{bot_message}
+
+새 요약:
+"""
+
+_updates = metrics.counter('session_summary_updates_total', '세션 요약 갱신 결과')
+
+_executor = ThreadPoolExecutor(max_workers=SUMMARY_WORKERS, thread_name_prefix="session-summary")
+# 같은 세션의 갱신은 순서대로 (이전 요약을 읽고 덮어쓰므로)
+# 세션마다 락을 만들면 세션 수만큼 계속 늘어나므로 고정 개수의 락을 나눠 씀
+SESSION_LOCK_STRIPES = 64
+_session_locks = [threading.Lock() for _ in range(SESSION_LOCK_STRIPES)]
+
+
+def _session_lock(session_pk: int) -> threading.Lock:
+    return _session_locks[session_pk % SESSION_LOCK_STRIPES]
+
+
+def summarize_turn(summary: Optional[str], user_message: str, bot_message: str) -> str:
+    """이전 요약과 한 턴의 대화로 새 요약을 만듭니다."""
+    prompt = PromptTemplate.from_template(SUMMARY_TEMPLATE)
+    chain = prompt | get_llm('gpt-4o-mini', temperature=0) | StrOutputParser()
+    new_summary = chain.invoke({
+        "summary": summary or "(없음)",
+        "user_message": truncate_to_tokens(user_message, TURN_MESSAGE_TOKEN_LIMIT),
+        "bot_message": truncate_to_tokens(bot_message, TURN_MESSAGE_TOKEN_LIMIT),
+    })
+    return truncate_to_tokens(new_summary.strip(), SUMMARY_TOKEN_LIMIT)
+
+
+def update_session_summary(session_pk: int, user_message: str, bot_message: str) -> Optional[str]:
+    """sessions.id가 session_pk인 세션의 요약을 갱신하고 새 요약을 반환합니다."""
+    with _session_lock(session_pk):
+        db = SessionLocal()
+        try:
+            session = db.query(ChatSession).filter(ChatSession.id == session_pk).first()
+            if session is None:
+                _updates.inc(result="missing_session")
+                return None
+            session.summary = summarize_turn(session.summary, user_message, bot_message)
+            db.commit()
+            _updates.inc(result="ok")
+            return session.summary
+        except Exception as e:
+            db.rollback()
+            _updates.inc(result="error")
+            logger.error(f"Error updating summary for session {session_pk}: {str(e)}")
+            return None
+        finally:
+            db.close()
+
+
+def schedule_summary_update(session_pk: int, user_message: str, bot_message: str) -> Future:
+    """요약 갱신을 백그라운드 스레드에 맡깁니다 (응답을 기다리게 하지 않음)."""
+    return _executor.submit(update_session_summary, session_pk, user_message, bot_message)
+
+
+def shutdown_summarizer(wait: bool = True) -> None:
+    """진행 중인 요약 갱신을 마치고 스레드 풀을 정리합니다."""
+    _executor.shutdown(wait=wait)
@@ -0,0 +1,61 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """진행 중인 호출 하나의 결과를 기다리는 호출자들이 공유하는 상태"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 호출을 하나의 실행으로 합칩니다 (request coalescing).
+    처음 들어온 호출자(leader)만 fn을 실행하고, 실행 중에 들어온 호출자는 그 결과를 공유합니다.
+    실행이 끝나면 키가 해제되므로 결과를 캐시하지는 않습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Returns (result, shared). shared가 True이면 다른 호출자의 실행 결과를 받은 것입니다.
+        leader에서 발생한 예외는 기다리던 호출자에게도 그대로 전달됩니다.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """현재 실행 중인 키 개수"""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,136 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+# 캐시 파일 위치와 유효 기간
+DEFAULT_CACHE_PATH = Path(
+    os.getenv('TOUR_API_CACHE_PATH',
+              Path(__file__).resolve().parent.parent / 'data' / 'db' / 'tour_api_cache.sqlite3')
+)
+PLACE_LIST_TTL = 24 * 60 * 60        # areaBasedList 페이지: 1일
+PET_DETAIL_TTL = 7 * 24 * 60 * 60    # detailPetTour: 7일
+
+
+class TourApiCache:
+    """
+    KorPetTourService 응답을 SQLite에 저장하는 로컬 캐시.
+    - area_based_list: (areaCode, sigunguCode, contentTypeId, pageNo, numOfRows) 단위 목록 페이지
+    - pet_detail: contentid 단위 반려동물 동반 정보 (modifiedtime 기준 조건부 갱신)
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH,
+                 list_ttl: float = PLACE_LIST_TTL, detail_ttl: float = PET_DETAIL_TTL):
+        self.path = Path(path)
+        self.list_ttl = list_ttl
+        self.detail_ttl = detail_ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS area_based_list (
+                cache_key   TEXT PRIMARY KEY,
+                items       TEXT NOT NULL,
+                fetched_at  REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pet_detail (
+                contentid    TEXT PRIMARY KEY,
+                pet_info     TEXT NOT NULL,
+                modifiedtime TEXT,
+                fetched_at   REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _list_key(area_code: int, sigungu_code: Optional[int], content_type_id: int,
+                  page_no: int, num_of_rows: int) -> str:
+        return f"{area_code}:{sigungu_code or ''}:{content_type_id}:{page_no}:{num_of_rows}"
+
+    def get_place_list(self, area_code: int, sigungu_code: Optional[int], content_type_id: int,
+                       page_no: int, num_of_rows: int) -> Optional[Any]:
+        """유효 기간 안의 목록 페이지를 반환합니다. 없거나 만료되면 None"""
+        key = self._list_key(area_code, sigungu_code, content_type_id, page_no, num_of_rows)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT items, fetched_at FROM area_based_list WHERE cache_key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.list_ttl:
+            return None
+        return json.loads(row[0])
+
+    def set_place_list(self, area_code: int, sigungu_code: Optional[int], content_type_id: int,
+                       page_no: int, num_of_rows: int, items: Any) -> None:
+        key = self._list_key(area_code, sigungu_code, content_type_id, page_no, num_of_rows)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO area_based_list (cache_key, items, fetched_at) VALUES (?, ?, ?)",
+                (key, json.dumps(items, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+
+    def get_pet_detail(self, contentid: Any, modifiedtime: Optional[str] = None) -> Optional[str]:
+        """
+        캐시된 반려동물 동반 정보를 반환합니다.
+        유효 기간이 지났더라도 목록의 modifiedtime이 저장된 값과 같으면 변경이 없는 것으로 보고
+        유효 기간을 연장해 그대로 사용합니다 (조건부 갱신).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT pet_info, modifiedtime, fetched_at FROM pet_detail WHERE contentid = ?",
+                (str(contentid),),
+            ).fetchone()
+            if row is None:
+                return None
+            pet_info, cached_modifiedtime, fetched_at = row
+            if time.time() - fetched_at <= self.detail_ttl:
+                return pet_info
+            if modifiedtime and modifiedtime == cached_modifiedtime:
+                self._conn.execute(
+                    "UPDATE pet_detail SET fetched_at = ? WHERE contentid = ?",
+                    (time.time(), str(contentid)),
+                )
+                self._conn.commit()
+                return pet_info
+        return None
+
+    def set_pet_detail(self, contentid: Any, pet_info: str, modifiedtime: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pet_detail (contentid, pet_info, modifiedtime, fetched_at) "
+                "VALUES (?, ?, ?, ?)",
+                (str(contentid), pet_info, modifiedtime, time.time()),
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """유효 기간이 지난 목록 페이지를 지웁니다. 상세 정보는 조건부 갱신을 위해 남겨둡니다."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM area_based_list WHERE fetched_at < ?", (time.time() - self.list_ttl,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[TourApiCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_tour_api_cache() -> TourApiCache:
+    """프로세스 전체에서 공유하는 캐시 인스턴스"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TourApiCache()
+        return _cache
@@ -0,0 +1,161 @@
+"""
+KorPetTourService 데이터를 벡터 DB에 미리 적재하는 동기화 작업.
+
+사용자 질의 시점에 외부 API를 호출하는 대신, 시/도·콘텐츠 타입별 areaBasedList를
+전부 페이지 단위로 훑어 새로 생겼거나 변경된(modifiedtime 기준) 장소만 상세 정보와 함께
+한 번에 임베딩합니다. Retriever의 실시간 보강은 드문 경우의 폴백으로만 남습니다.
+
+    python src/tour_api_sync.py                      # 전체 카테고리·지역 1회 동기화
+    python src/tour_api_sync.py --category 숙박 --areas 32 39
+    python src/tour_api_sync.py --interval-hours 24  # 24시간마다 반복
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import vector_manger as vm
+from fetch_pt_places import (
+    CONTENT_TYPE_IDS,
+    fetch_pet_details,
+    iter_area_based_places,
+    load_area_code_index,
+    preload_area_code_index,
+    service_key,
+)
+from tour_api_cache import get_tour_api_cache
+from vectordb_updater import VectorDBUpdater, get_db_updater
+
+logger = logging.getLogger(__name__)
+
+# 벡터 DB가 있는 카테고리만 동기화
+SYNC_CATEGORIES = [c for c in ("관광지", "숙박") if c in vm.category_to_db]
+SYNC_DETAIL_DEADLINE = 300.0  # 카테고리 하나의 상세 정보 조회를 기다리는 최대 시간(초)
+SYNC_EMBED_BATCH_SIZE = 256
+
+
+def _index_existing_documents(category: str) -> Tuple[Dict[str, Tuple[str, Optional[str]]], set]:
+    """
+    벡터 DB에 이미 있는 문서를 색인합니다.
+    Returns (contentid → (docstore ID, modifiedtime), contentid가 없는 기존 문서의 title 집합)
+    """
+    db = vm.load_db(vm.category_to_db[category])
+    by_contentid: Dict[str, Tuple[str, Optional[str]]] = {}
+    titles = set()
+    for doc_id, doc in db.docstore._dict.items():
+        metadata = doc.metadata or {}
+        contentid = metadata.get("contentid")
+        if contentid:
+            by_contentid[str(contentid)] = (doc_id, metadata.get("modifiedtime"))
+        elif metadata.get("title"):
+            titles.add(metadata["title"])
+    return by_contentid, titles
+
+
+def sync_category(category: str, updater: VectorDBUpdater,
+                  area_codes: Optional[List[int]] = None) -> Dict[str, int]:
+    """카테고리 하나를 동기화하고 처리 통계를 반환합니다."""
+    content_type_id = CONTENT_TYPE_IDS[category]
+    if area_codes is None:
+        area_codes = sorted({area_code for _, area_code, sigungu_code in load_area_code_index().entries
+                             if sigungu_code is None})
+
+    existing, existing_titles = _index_existing_documents(category)
+    stats = {"scanned": 0, "new": 0, "changed": 0, "unchanged": 0, "detail_retry": 0, "failed": 0}
+    # (장소, 교체할 기존 문서의 docstore ID 또는 None)
+    pending: List[Tuple[Dict[str, Any], Optional[str]]] = []
+
+    for area_code in area_codes:
+        try:
+            for item in iter_area_based_places(area_code, content_type_id, use_cache=False):
+                stats["scanned"] += 1
+                contentid = str(item.get("contentid", ""))
+                replace_id = None
+                if contentid in existing:
+                    doc_id, modifiedtime = existing[contentid]
+                    if modifiedtime == item.get("modifiedtime"):
+                        stats["unchanged"] += 1
+                        continue
+                    replace_id = doc_id
+                    stats["changed"] += 1
+                elif item.get("title") in existing_titles:
+                    stats["unchanged"] += 1
+                    continue
+                else:
+                    stats["new"] += 1
+                pending.append((item, replace_id))
+        except Exception as e:
+            logger.error(f"Error scanning area {area_code} for {category}: {str(e)}")
+
+    if not pending:
+        logger.info(f"[{category}] nothing to ingest: {stats}")
+        return stats
+
+    # 상세 정보는 로컬 캐시 + 동시 조회로 한 번에 가져옴
+    details = fetch_pet_details(
+        [item["contentid"] for item, _ in pending], service_key,
+        deadline=SYNC_DETAIL_DEADLINE,
+        modified_times={item["contentid"]: item.get("modifiedtime") for item, _ in pending},
+    )
+
+    # 상세 정보를 실제로 받은(캐시에 저장된) 장소만 적재. deadline을 넘겼거나 요청이 실패한 장소는
+    # 건너뛰어 다음 동기화에서 새 항목/변경 항목으로 다시 조회되게 함 (기존 문서도 그대로 둠)
+    cache = get_tour_api_cache()
+    ready: List[Tuple[Dict[str, Any], Optional[str]]] = []
+    for item, replace_id in pending:
+        contentid = item["contentid"]
+        if contentid in details and cache.get_pet_detail(contentid, item.get("modifiedtime")) is not None:
+            item["pet_info"] = details[contentid]
+            ready.append((item, replace_id))
+        else:
+            stats["detail_retry"] += 1
+
+    # 배치 단위로 임베딩해 벡터 DB에 반영 (변경된 문서는 같은 배치에서 기존 버전을 교체).
+    # 인덱스 저장은 카테고리당 마지막에 한 번만
+    with updater.write_batch(category) as add:
+        for start in range(0, len(ready), SYNC_EMBED_BATCH_SIZE):
+            batch = ready[start:start + SYNC_EMBED_BATCH_SIZE]
+            documents = updater.create_documents_from_api_data([item for item, _ in batch], category,
+                                                               user_query="scheduled_sync")
+            replace_ids = [replace_id for _, replace_id in batch if replace_id]
+            try:
+                add(documents, replace_ids or None)
+            except Exception as e:
+                logger.error(f"[{category}] failed to ingest batch at {start}: {str(e)}")
+                stats["failed"] += len(batch)
+
+    logger.info(f"[{category}] sync finished: {stats}")
+    return stats
+
+
+def run_sync(categories: Optional[List[str]] = None,
+             area_codes: Optional[List[int]] = None) -> Dict[str, Dict[str, int]]:
+    """여러 카테고리를 순서대로 동기화합니다."""
+    # 배포 후 첫 동기화라면 지역 코드 테이블부터 생성 (없거나 버전이 다르면 Tour API로 생성)
+    preload_area_code_index()
+    updater = get_db_updater()
+    results = {}
+    for category in categories or SYNC_CATEGORIES:
+        started = time.perf_counter()
+        results[category] = sync_category(category, updater, area_codes)
+        logger.info(f"[{category}] took {time.perf_counter() - started:.1f}s")
+    return results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Tour API → 벡터 DB 사전 적재")
+    parser.add_argument("--category", nargs="+", choices=SYNC_CATEGORIES, help="동기화할 카테고리 (기본: 전체)")
+    parser.add_argument("--areas", nargs="+", type=int, help="동기화할 시/도 코드 (기본: 전체)")
+    parser.add_argument("--interval-hours", type=float, help="지정하면 이 간격으로 계속 반복 실행")
+    args = parser.parse_args()
+
+    while True:
+        print(run_sync(args.category, args.areas))
+        if not args.interval_hours:
+            break
+        time.sleep(args.interval_hours * 3600)
@@ -0,0 +1,66 @@
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import query_rules as qr
+from keyword_matcher import KeywordMatcher
+from category_validator import CATEGORY_TYPES
+
+QUERIES = [
+    "안녕하세요",
+    "Hi there",
+    "this history museum",
+    "서울 날씨 어때?",
+    "KTX 반려견 탑승 가능해?",
+    "강릉 반려견 펜션 추천해줘",
+    "이번 주말에 버스타고 속초 가서 하루 자고 오고 싶어. 강아지랑 같이 갈 수 있을까?",
+    "제주도에 고양이랑 2박 3일 여행 가고 싶은데 숙소랑 가볼만한 곳 알려줘",
+] * 25
+PLACE_TYPES = ["호텔", "Pension 펜션", "애견카페", "버스터미널", "전망대 카페", "캠핑장"] * 25
+
+
+# 기존 방식: 호출마다 소문자 변환 후 키워드를 하나씩 부분 문자열 검사
+def naive_greeting(query):
+    greetings = ["안녕", "안녕하세요", "hello", "hi"]
+    query_lower = query.lower().strip()
+    return any(greeting in query_lower for greeting in greetings)
+
+
+def naive_categories(query):
+    query_lower = query.lower()
+    return [category for category, keywords in qr.CATEGORY_KEYWORDS.items()
+            if any(keyword.lower() in query_lower for keyword in keywords)]
+
+
+def naive_place_type(category, place_type):
+    place_type_lower = place_type.lower()
+    valid_types = [t.lower() for t in CATEGORY_TYPES[category]]
+    return any(t in place_type_lower for t in valid_types)
+
+
+type_matchers = {category: KeywordMatcher(types) for category, types in CATEGORY_TYPES.items()}
+
+
+def bench(label, naive, shared, number=50):
+    naive_time = timeit.timeit(naive, number=number) / number
+    shared_time = timeit.timeit(shared, number=number) / number
+    print(f'{label:<12} 기존 {naive_time * 1e3:.3f} ms, 공유 매처 {shared_time * 1e3:.3f} ms '
+          f'({naive_time / shared_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    # 정확도: 영문 단어 경계 외에는 기존 결과와 같아야 함
+    for query in set(QUERIES):
+        print(f'{query[:30]:<32} greeting {naive_greeting(query)!s:<5} → {qr.is_greeting(query)!s:<5} '
+              f'categories {naive_categories(query)} → {qr.match_categories(query)}')
+    for place_type in set(PLACE_TYPES):
+        for category in CATEGORY_TYPES:
+            assert naive_place_type(category, place_type) == type_matchers[category].search(place_type)
+
+    bench('greeting', lambda: [naive_greeting(q) for q in QUERIES],
+          lambda: [qr.is_greeting(q) for q in QUERIES])
+    bench('categories', lambda: [naive_categories(q) for q in QUERIES],
+          lambda: [qr.match_categories(q) for q in QUERIES])
+    bench('place_type', lambda: [naive_place_type(c, t) for t in PLACE_TYPES for c in CATEGORY_TYPES],
+          lambda: [type_matchers[c].search(t) for t in PLACE_TYPES for c in CATEGORY_TYPES])
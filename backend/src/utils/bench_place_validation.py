@@ -0,0 +1,74 @@
+import os
+import sys
+import json
+import time
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from langchain.schema import Document
+
+STUB_LATENCY = 0.05  # 요청당 모의 지연 (초)
+KNOWN_PLACES = {f"강릉 반려견 카페 {i}" for i in range(0, 40, 2)}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """네이버 지역 검색 스텁: KNOWN_PLACES에 있는 이름만 결과 1건"""
+    protocol_version = "HTTP/1.1"
+    requests_served = 0
+
+    def do_GET(self):
+        StubHandler.requests_served += 1
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query).get('query', [''])[0]
+        time.sleep(STUB_LATENCY)
+        items = [{"title": query}] if query in KNOWN_PLACES else []
+        body = json.dumps({"items": items}).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    request_queue_size = 64  # 기본 backlog(5)로는 동시 연결이 connect 타임아웃에 걸림
+
+
+server = StubServer(('127.0.0.1', 0), StubHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+os.environ['NAVER_LOCAL_SEARCH_URL'] = f"http://127.0.0.1:{server.server_port}/v1/search/local.json"
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from naver_map_utils import NAVER_LOCAL_SEARCH_URL, NaverMapUtils, clear_validation_cache
+
+NAMES = [f"강릉 반려견 카페 {i}" for i in range(40)]
+DOCS = [Document(page_content=name, metadata={"title": name}) for name in NAMES + NAMES[:10]]
+
+
+# 기존 방식: 장소마다 새 연결로 순차 요청
+def naive_is_valid(place_name):
+    response = requests.get(NAVER_LOCAL_SEARCH_URL, params={'query': place_name, 'display': 1})
+    return len(response.json().get('items', [])) > 0
+
+
+def timed(label, func):
+    served = StubHandler.requests_served
+    started = time.perf_counter()
+    result = func()
+    print(f"{label:<22} {(time.perf_counter() - started) * 1e3:8.1f} ms, "
+          f"requests {StubHandler.requests_served - served}")
+    return result
+
+
+if __name__ == '__main__':
+    expected = [doc.metadata["title"] in KNOWN_PLACES for doc in DOCS]
+    naive = timed("sequential (기존)", lambda: [naive_is_valid(doc.metadata["title"]) for doc in DOCS])
+    clear_validation_cache()
+    cold = timed("batched, cold cache", lambda: NaverMapUtils.validate_documents(DOCS))
+    warm = timed("batched, warm cache", lambda: NaverMapUtils.validate_documents(DOCS))
+    assert naive == cold == warm == expected
+    server.shutdown()
@@ -0,0 +1,140 @@
+import os
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_core.messages import HumanMessage
+from langchain_openai import ChatOpenAI
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import prompts
+
+# 모의 제공자의 프롬프트 캐시 규칙 (OpenAI 방식: 1024토큰 이상, 128토큰 단위로 접두부 재사용)
+MIN_CACHEABLE_TOKENS = 1024
+CACHE_BLOCK_TOKENS = 128
+BASE_LATENCY = 0.02               # 요청당 고정 지연 (초)
+UNCACHED_TOKEN_LATENCY = 0.00005  # 캐시되지 않은 입력 토큰당 지연
+CACHED_TOKEN_LATENCY = 0.000005   # 캐시된 입력 토큰당 지연
+
+
+def estimate_tokens(text):
+    """모의 제공자의 토큰 수 추정 (UTF-8 바이트 / 3)"""
+    return (len(text.encode('utf-8')) + 2) // 3
+
+
+class MockProvider:
+    """이전 요청과 겹치는 가장 긴 접두부를 캐시된 토큰으로 계산하는 /chat/completions 스텁"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.seen = []
+
+    def reset(self):
+        with self.lock:
+            self.seen = []
+
+    def usage(self, messages):
+        prompt = "".join(f"<|{m['role']}|>{m['content']}" for m in messages)
+        prompt_tokens = estimate_tokens(prompt)
+        with self.lock:
+            common = max((len(os.path.commonprefix([prompt, old])) for old in self.seen), default=0)
+            self.seen.append(prompt)
+        cached = estimate_tokens(prompt[:common]) // CACHE_BLOCK_TOKENS * CACHE_BLOCK_TOKENS
+        if prompt_tokens < MIN_CACHEABLE_TOKENS or cached < MIN_CACHEABLE_TOKENS:
+            cached = 0
+        return prompt_tokens, cached
+
+
+provider = MockProvider()
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt_tokens, cached = provider.usage(request['messages'])
+        time.sleep(BASE_LATENCY + (prompt_tokens - cached) * UNCACHED_TOKEN_LATENCY
+                   + cached * CACHED_TOKEN_LATENCY)
+        body = json.dumps({
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o-mini"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "관광지"},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 1,
+                      "total_tokens": prompt_tokens + 1,
+                      "prompt_tokens_details": {"cached_tokens": cached}},
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+QUERIES = [
+    "강릉으로 강아지랑 2박 3일 여행 가고 싶어",
+    "제주도 고양이 동반 숙소 추천해줘",
+    "부산 해운대 날씨 어때?",
+    "이번 주말에 속초 가서 하루 자고 오고 싶어. 강아지랑 같이 갈 수 있을까?",
+    "양양에 반려견 두 마리랑 4일간 머물 곳 있을까?",
+    "서울에서 애견 동반 가능한 카페 알려줘",
+]
+
+
+def response_inputs(query, i):
+    # 검색 결과 크기가 요청마다 달라지도록 구성
+    content = "\n".join(f"### {n}. 장소 {n}\n{query} 관련 반려동물 동반 장소 설명입니다." for n in range(1, 4 + i))
+    return {"query": query, "region": "강릉", "pet_type": "강아지", "days": 2,
+            "chat_history": "", "content": content}
+
+
+CASES = {
+    "category": (prompts.category_prompt(), lambda q, i: {"input": q}),
+    "user_parser": (prompts.user_parser_prompt(), lambda q, i: {"query": q}),
+    "response": (prompts.response_prompt(), response_inputs),
+}
+
+
+def variable_first(messages):
+    """기존 배치: 요청별 값이 고정 지침보다 앞에 오는 단일 메시지"""
+    system, human = messages
+    return [HumanMessage(content=human.content + "\n\n" + system.content)]
+
+
+def run(llm, prompt, make_inputs, layout):
+    provider.reset()
+    prompt_tokens = cached_tokens = 0
+    started = time.perf_counter()
+    for i, query in enumerate(QUERIES):
+        messages = prompt.format_messages(**make_inputs(query, i))
+        if layout == "variable-first":
+            messages = variable_first(messages)
+        usage = llm.invoke(messages).usage_metadata
+        prompt_tokens += usage["input_tokens"]
+        cached_tokens += usage.get("input_token_details", {}).get("cache_read", 0)
+    elapsed = time.perf_counter() - started
+    return cached_tokens / prompt_tokens, elapsed / len(QUERIES), prompt_tokens // len(QUERIES)
+
+
+if __name__ == '__main__':
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    llm = ChatOpenAI(model="gpt-4o-mini", api_key="mock", max_retries=0,
+                     base_url=f"http://127.0.0.1:{server.server_port}/v1")
+
+    print(f"{'prompt':<12} {'layout':<15} {'avg tokens':>10} {'cached':>8} {'latency':>10}")
+    for name, (prompt, make_inputs) in CASES.items():
+        for layout in ("variable-first", "stable-prefix"):
+            ratio, latency, tokens = run(llm, prompt, make_inputs, layout)
+            print(f"{name:<12} {layout:<15} {tokens:>10} {ratio:>8.1%} {latency * 1e3:>8.1f}ms")
+
+    server.shutdown()
@@ -0,0 +1,33 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import retriever as rt
+
+# process_query 한 번에 드는 Retriever 준비 비용만 비교 (LLM/검색 호출 제외)
+calls = 50
+
+
+def bench(label, func):
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    elapsed = time.perf_counter() - started
+    print(f'{label} : 총 {elapsed * 1e3:.1f} ms, 호출당 {elapsed / calls * 1e3:.3f} ms')
+    return elapsed
+
+
+if __name__ == '__main__':
+    # 최초 생성 비용(임베딩 모델 로드 등)은 두 경로가 한 번씩 똑같이 치르므로 미리 워밍업
+    rt.get_retriever()
+
+    # 공유 인스턴스는 같은 객체·같은 클라이언트를 돌려줘야 함
+    assert rt.get_retriever() is rt.get_retriever()
+    assert rt.Retriever().llm is rt.get_retriever().llm
+
+    per_call = bench('호출마다 Retriever()', rt.Retriever)
+    shared = bench('get_retriever()', rt.get_retriever)
+    print(f'호출당 절감 : {(per_call - shared) / calls * 1e3:.3f} ms')
+
+    rt.shutdown_retriever()
@@ -0,0 +1,67 @@
+import os
+import sys
+import json
+import time
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import fetch_pt_places as fpp
+
+# detailPetTour 응답을 흉내 내는 로컬 스텁 서버
+STUB_BODY = json.dumps({
+    "response": {"body": {"items": {"item": [{"contentid": "1", "acmpyPsblCpam": "소형견 동반 가능"}]}}}
+}, ensure_ascii=False).encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 지원
+    disable_nagle_algorithm = True  # 헤더/본문 분할 전송 시 지연 ACK 대기 방지
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(STUB_BODY)))
+        self.end_headers()
+        self.wfile.write(STUB_BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def curl_get_json(url):
+    """기존 방식: 호출마다 curl 프로세스 실행"""
+    result = subprocess.run(['curl', '-s', url], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def bench(label, func, urls):
+    started = time.perf_counter()
+    for url in urls:
+        func(url)
+    elapsed = time.perf_counter() - started
+    print(f'{label} : 총 {elapsed * 1e3:.1f} ms, 호출당 {elapsed / len(urls) * 1e3:.2f} ms')
+    return elapsed
+
+
+if __name__ == '__main__':
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    fpp.TOUR_API_BASE_URL = f'http://127.0.0.1:{server.server_port}'
+
+    calls = 200
+    urls = [
+        f"{fpp.TOUR_API_BASE_URL}/detailPetTour?serviceKey=test&_type=json&contentId={i}"
+        for i in range(calls)
+    ]
+
+    # 두 경로의 결과가 같은지 확인
+    assert curl_get_json(urls[0]) == fpp._get_json(urls[0])
+
+    curl_time = bench('subprocess curl', curl_get_json, urls)
+    pooled_time = bench('pooled httpx.Client', fpp._get_json, urls)
+    print(f'속도 향상 : {curl_time / pooled_time:.1f}x')
+
+    fpp.close_http_client()
+    server.shutdown()
@@ -0,0 +1,33 @@
+import os
+import sys
+import json
+import timeit
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import weather
+
+# 지역 좌표 테이블 + 한반도 범위의 임의 좌표
+with open(weather.DEFAULT_CITY_INFO_PATH, 'r', encoding='utf-8') as f:
+    city_data = json.load(f)
+
+rng = np.random.default_rng(0)
+lats = np.concatenate([[float(v['lat']) for v in city_data.values()], rng.uniform(33.0, 38.7, 10000)])
+lons = np.concatenate([[float(v['lon']) for v in city_data.values()], rng.uniform(124.5, 131.0, 10000)])
+
+# 정확도 검증: 스칼라 함수와 격자 좌표가 모두 같아야 함
+nxs, nys = weather.latlon_to_grid_batch(lats, lons)
+expected = [weather.latlon_to_grid(lat, lon) for lat, lon in zip(lats.tolist(), lons.tolist())]
+mismatches = [
+    (lat, lon, grid, (nx, ny))
+    for lat, lon, grid, nx, ny in zip(lats.tolist(), lons.tolist(), expected, nxs.tolist(), nys.tolist())
+    if grid != (nx, ny)
+]
+assert not mismatches, mismatches[:10]
+print(f'정확도 검증 통과 : {len(lats)}개 좌표')
+
+number = 20
+scalar = timeit.timeit(lambda: [weather.latlon_to_grid(a, b) for a, b in zip(lats.tolist(), lons.tolist())], number=number)
+batch = timeit.timeit(lambda: weather.latlon_to_grid_batch(lats, lons), number=number)
+print(f'스칼라 변환 : {scalar / number * 1e3:.2f} ms')
+print(f'배치 변환 : {batch / number * 1e3:.2f} ms ({scalar / batch:.1f}x)')
@@ -0,0 +1,41 @@
+import os
+import sys
+import json
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import weather
+
+# 지역 좌표 테이블 로드
+with open(weather.DEFAULT_CITY_INFO_PATH, 'r', encoding='utf-8') as f:
+    city_data = json.load(f)
+
+region_index = weather.load_region_index()
+
+# 모든 지역 키와 그 부분 문자열(부분 지역명 질의)을 벤치마크 입력으로 사용
+queries = list(city_data)
+queries += sorted({key[i:] for key in city_data for i in range(1, len(key))})
+
+
+def linear_scan():
+    for city in queries:
+        city if city in city_data else next((k for k in city_data if city in k), None)
+
+
+def indexed():
+    for city in queries:
+        region_index.resolve(city)
+
+
+# 기존 선형 탐색과 결과가 같은지 먼저 확인
+for city in queries:
+    expected = city if city in city_data else next((k for k in city_data if city in k), None)
+    assert region_index.resolve(city) == expected, city
+
+number = 50
+linear = timeit.timeit(linear_scan, number=number) / (number * len(queries))
+fast = timeit.timeit(indexed, number=number) / (number * len(queries))
+
+print(f'지역 키 수 : {len(city_data)}, 질의 수 : {len(queries)}')
+print(f'선형 탐색 : {linear * 1e6:.2f} us/lookup')
+print(f'인덱스 조회 : {fast * 1e6:.2f} us/lookup ({linear / fast:.1f}x)')
@@ -1,4 +1,4 @@
-import pathlib, functools, torch
+import pathlib, functools, torch, contextlib
 from langchain_community.vectorstores import FAISS
 from langchain_huggingface.embeddings import HuggingFaceEmbeddings
 from typing import Dict, List, Sequence, Optional, Tuple
@@ -6,6 +6,11 @@ from langchain.schema import Document
 import logging 
 import ast
 import os
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 동작
+    fcntl = None
+from naver_map_utils import NaverMapUtils
 
 # Initialize device at module level
 _DEVICE = None
@@ -27,12 +32,18 @@ def _initialize_device():
 
 # 벡터 스코어 로그 
 _db_cache: Dict[str, FAISS] = {}
+# 캐시된 DB를 읽을 때의 파일 버전 (다른 프로세스가 저장하면 바뀜)
+_db_versions: Dict[str, Tuple[int, int]] = {}
 category_to_db: Dict[str, str] = {
     "관광지": "faiss_place_kure",
     "숙박":   "faiss_pet_kure",
     "대중교통": "faiss_regular_kure",
 }
 
+# 적응형 k: 후보를 넉넉히 뽑은 뒤 점수가 급격히 떨어지는 지점에서 잘라냄
+ADAPTIVE_MIN_K = int(os.getenv('RETRIEVAL_MIN_K', '3'))
+ADAPTIVE_SCORE_GAP = float(os.getenv('RETRIEVAL_SCORE_GAP', '0.075'))  # 코사인 유사도 기준
+
 def get_device():
     """Get the appropriate device for computation"""
     device = _initialize_device()
@@ -64,36 +75,106 @@ def get_project_root():
     current_file = pathlib.Path(__file__).resolve()
     return current_file.parent.parent
 
+def get_db_path(name: str) -> pathlib.Path:
+    return get_project_root() / "data" / "db" / "faiss" / name
+
+def _db_version(db_path: pathlib.Path) -> Optional[Tuple[int, int]]:
+    """index.faiss / index.pkl의 수정 시각 (없으면 None)"""
+    try:
+        return ((db_path / "index.faiss").stat().st_mtime_ns,
+                (db_path / "index.pkl").stat().st_mtime_ns)
+    except FileNotFoundError:
+        return None
+
+@contextlib.contextmanager
+def db_file_lock(name: str, exclusive: bool = True):
+    """
+    DB 파일에 대한 프로세스 간 잠금.
+    저장(exclusive)과 읽기(shared)가 겹치지 않게 해서, API 서버와 동기화 작업이
+    서로 쓰다 만 인덱스를 읽거나 상대의 변경을 덮어쓰지 않도록 합니다.
+    """
+    if fcntl is None:
+        yield
+        return
+    lock_path = get_db_path(name).with_name(f"{name}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def read_db(name: str) -> FAISS:
+    """
+    디스크에서 DB를 새로 읽습니다 (캐시를 거치지 않음).
+    쓰기 쪽은 db_file_lock 안에서 호출해 다른 프로세스의 최신 저장본 위에 변경을 얹습니다.
+    """
+    db_path = get_db_path(name)
+    if not db_path.exists():
+        logging.error(f"Database directory not found: {db_path}")
+        raise FileNotFoundError(f"Database directory not found: {db_path}")
+
+    logging.info(f"Loading database from: {db_path}")
+    db = FAISS.load_local(
+        folder_path=str(db_path),
+        embeddings=get_embedding(),
+        allow_dangerous_deserialization=True,
+    )
+    # 지도 링크가 없는 기존 문서 보강 (다음 저장 시 함께 기록됨)
+    backfilled = NaverMapUtils.annotate_documents(db.docstore._dict.values())
+    if backfilled:
+        logging.info(f"Backfilled map links for {backfilled} documents in {name}")
+    return db
+
 def load_db(name: str) -> FAISS:
     """
     FAISS 데이터베이스를 로드합니다.
-    데이터베이스가 이미 캐시되어 있다면 캐시된 버전을 반환합니다.
+    캐시된 버전이 있고 디스크의 파일이 그 뒤로 바뀌지 않았다면 캐시된 버전을 반환합니다.
+    다른 프로세스(tour_api_sync 등)가 저장하면 다음 호출에서 다시 읽습니다.
     """
-    if name in _db_cache:
+    db_path = get_db_path(name)
+    if name in _db_cache and _db_versions.get(name) == _db_version(db_path):
         logging.info(f"Using cached database: {name}")
         return _db_cache[name]
-    
+
     try:
-        root_dir = get_project_root()
-        db_path = root_dir / "data" / "db" / "faiss" / name
-        
-        if not db_path.exists():
-            logging.error(f"Database directory not found: {db_path}")
-            raise FileNotFoundError(f"Database directory not found: {db_path}")
-            
-        logging.info(f"Loading database from: {db_path}")
-        db = FAISS.load_local(
-            folder_path=str(db_path),
-            embeddings=get_embedding(),
-            allow_dangerous_deserialization=True,
-        )
+        with db_file_lock(name, exclusive=False):
+            version = _db_version(db_path)
+            db = read_db(name)
         logging.info(f"Successfully loaded database: {name}")
-        _db_cache[name] = db
+        set_cached_db(name, db, version)
         return db
     except Exception as e:
         logging.error(f"Error loading database {name}: {str(e)}")
         raise
 
+def set_cached_db(name: str, db: FAISS, version: Optional[Tuple[int, int]] = None):
+    """캐시를 db로 교체합니다. version은 db가 반영하는 파일 버전 (기본: 현재 디스크 버전)"""
+    _db_versions[name] = _db_version(get_db_path(name)) if version is None else version
+    _db_cache[name] = db
+
+def adaptive_cutoff(
+    scores: Sequence[float],
+    max_k: int,
+    *,
+    min_k: int = ADAPTIVE_MIN_K,
+    score_gap: float = ADAPTIVE_SCORE_GAP,
+    min_score: Optional[float] = None,
+) -> int:
+    """
+    내림차순 점수 목록에서 앞쪽 몇 개를 남길지 정합니다.
+    min_k개 이후로는 점수가 min_score 아래로 내려가거나, 바로 앞 문서와의 점수 차가
+    score_gap보다 커지는 첫 지점에서 자릅니다. 최대 max_k개.
+    """
+    n = min(len(scores), max_k)
+    for i in range(max(min_k, 1), n):
+        if min_score is not None and scores[i] < min_score:
+            return i
+        if scores[i - 1] - scores[i] > score_gap:
+            return i
+    return n
+
 def multiretrieve_by_category(
     query: str,
     categories: Sequence[str] | str,
@@ -101,10 +182,22 @@ def multiretrieve_by_category(
     k_each: int = 5,
     top_k: int = 5,
     weights: Optional[Dict[str, float]] = None,
+    adaptive: bool = False,
+    min_k: int = ADAPTIVE_MIN_K,
+    score_gap: float = ADAPTIVE_SCORE_GAP,
+    min_score: Optional[float] = None,
 ) -> Dict[str, List[Document]]:
     """
     카테고리별로 문서를 검색합니다.
     날씨 카테고리는 DB 검색에서 제외되며, 호출측에서 별도 처리해야 합니다.
+
+    반환되는 Document는 docstore 원본의 복사본이며, metadata에 점수가 붙어 있습니다.
+    - distance: FAISS 기본 L2 거리의 제곱 (작을수록 유사, 0~4)
+    - relevance_score: 코사인 유사도 (1 - distance / 2) * weight (클수록 유사, -1~1)
+      임베딩이 정규화되어 있으므로 ||a - b||² = 2 - 2cos(a, b)
+
+    adaptive=True이면 k_each개의 후보를 뽑은 뒤 adaptive_cutoff로 관련도가 높은 앞부분만
+    (min_k ~ top_k개) 반환합니다. 좁은 질의일수록 프롬프트에 들어가는 문서가 줄어듭니다.
     """
     if not query or not isinstance(query, str):
         logging.error("Invalid query: query must be a non-empty string")
@@ -138,13 +231,28 @@ def multiretrieve_by_category(
             docs_scores: List[Tuple[Document, float]] = db.similarity_search_with_score(query, k=k_each)
 
             w = 1.0 if weights is None else weights.get(cat, 1.0)
+            # L2 거리 제곱 → 코사인 유사도 (quality_threshold 등 임계값은 이 척도 기준)
             ranked = sorted(
-                (((1 - score) * w, doc) for doc, score in docs_scores),
+                (((1 - score / 2) * w, doc, score) for doc, score in docs_scores),
                 key=lambda x: x[0],
                 reverse=True,
             )[:top_k]
+            if adaptive:
+                keep = adaptive_cutoff([relevance for relevance, _, _ in ranked], top_k,
+                                       min_k=min_k, score_gap=score_gap, min_score=min_score)
+                logging.info(f"Adaptive cutoff for {cat}: kept {keep} of {len(docs_scores)} candidates")
+                ranked = ranked[:keep]
 
-            results[cat] = [doc for _, doc in ranked]
+            # docstore 원본을 건드리지 않도록 복사본에 점수를 기록
+            results[cat] = [
+                Document(
+                    page_content=doc.page_content,
+                    metadata={**(doc.metadata or {}),
+                              "relevance_score": float(relevance),
+                              "distance": float(score)},
+                )
+                for relevance, doc, score in ranked
+            ]
             logging.info(f"Found {len(results[cat])} results for category: {cat}")
             
         except Exception as e:
@@ -1,13 +1,17 @@
 import os
 import json
+import queue
 import logging
-from typing import List, Dict, Any
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 from langchain.schema import Document
 from langchain_community.vectorstores import FAISS
 from langchain_huggingface.embeddings import HuggingFaceEmbeddings
 import vector_manger as vm
+from naver_map_utils import NaverMapUtils
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +24,13 @@ class VectorDBUpdater:
         self.embedding_model = vm.get_embedding()
         self.category_to_db = vm.category_to_db
         self.update_log_file = self._get_update_log_path()
+        # FAISS 인덱스 수정/저장은 한 번에 하나씩
+        self._write_lock = threading.Lock()
+        # 백그라운드 쓰기 큐 (enqueue_documents)
+        self._write_queue: "queue.Queue[Tuple[List[Document], str]]" = queue.Queue()
+        self._pending_keys: set = set()
+        self._pending_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
         
     def _get_update_log_path(self) -> Path:
         """Get path for update log file"""
@@ -28,13 +39,15 @@ class VectorDBUpdater:
         log_dir.mkdir(parents=True, exist_ok=True)
         return log_dir / "vectordb_updates.json"
     
-    def add_documents_to_db(self, documents: List[Document], category: str) -> bool:
+    def add_documents_to_db(self, documents: List[Document], category: str,
+                            replace_ids: Optional[List[str]] = None) -> bool:
         """
         Add new documents to the appropriate VectorDB
         
         Args:
             documents: List of Document objects to add
             category: Category for the documents (관광지, 숙박, 대중교통)
+            replace_ids: Docstore IDs of outdated documents to delete once the new ones are added
             
         Returns:
             bool: Success status
@@ -43,37 +56,139 @@ class VectorDBUpdater:
             if category not in self.category_to_db:
                 logger.warning(f"Unknown category: {category}")
                 return False
-                
-            db_name = self.category_to_db[category]
-            
-            # Load existing database
-            existing_db = vm.load_db(db_name)
-            
-            # Create texts and metadatas for new documents
-            texts = [doc.page_content for doc in documents]
-            metadatas = [doc.metadata for doc in documents]
-            
-            # Add documents to existing database
-            existing_db.add_texts(texts=texts, metadatas=metadatas)
             
-            # Save updated database
-            self._save_updated_db(existing_db, db_name)
-            
-            # Log the update
-            self._log_update(category, len(documents), db_name)
+            with self.write_batch(category) as add:
+                added = add(documents, replace_ids)
             
-            logger.info(f"Successfully added {len(documents)} documents to {db_name}")
+            logger.info(f"Successfully added {added} of {len(documents)} documents to {self.category_to_db[category]}")
             return True
             
         except Exception as e:
             logger.error(f"Error adding documents to DB: {str(e)}")
             return False
     
+    @contextmanager
+    def write_batch(self, category: str) -> Iterator[Callable[..., int]]:
+        """
+        Apply several document batches to one VectorDB and save it once at the end
+        
+        Holds the in-process write lock and the cross-process file lock for the whole
+        block, so the API server and the sync job never save over each other's changes.
+        The batches are applied to a fresh copy read from disk and the cached index is
+        swapped for it after the save, so searches running meanwhile never see a
+        half-applied update. Nothing is saved if the block raises.
+        
+        add() skips documents whose contentid is already stored (unless that stored
+        document is being replaced) and returns the number actually added.
+        
+            with updater.write_batch("숙박") as add:
+                add(documents, replace_ids)
+        """
+        db_name = self.category_to_db[category]
+        with self._write_lock, vm.db_file_lock(db_name):
+            # Latest saved version (includes other processes' writes), not the cached copy
+            db = vm.read_db(db_name)
+            stored = {
+                str(doc.metadata["contentid"]): doc_id
+                for doc_id, doc in db.docstore._dict.items()
+                if (doc.metadata or {}).get("contentid")
+            }
+            added = []
+            
+            def add(documents: List[Document], replace_ids: Optional[List[str]] = None) -> int:
+                replacing = set(replace_ids or ())
+                fresh = []
+                for doc in documents:
+                    contentid = str((doc.metadata or {}).get("contentid") or "")
+                    if contentid and contentid in stored and stored[contentid] not in replacing:
+                        continue
+                    fresh.append(doc)
+                    if contentid:
+                        stored[contentid] = None  # also skip repeats within this call
+                if len(fresh) < len(documents):
+                    logger.info(f"Skipped {len(documents) - len(fresh)} documents already in {db_name}")
+                if fresh or replacing:
+                    new_ids = self._apply_documents(db, fresh, replace_ids)
+                    for doc, doc_id in zip(fresh, new_ids):
+                        contentid = (doc.metadata or {}).get("contentid")
+                        if contentid:
+                            stored[str(contentid)] = doc_id
+                added.append(len(fresh))
+                return len(fresh)
+            
+            yield add
+            
+            if any(added):
+                self._save_updated_db(db, db_name)
+                self._log_update(category, sum(added), db_name)
+    
+    @staticmethod
+    def _apply_documents(db: FAISS, documents: List[Document], replace_ids: Optional[List[str]] = None) -> List[str]:
+        """Add documents to db, then delete the outdated versions they replace. Returns the new docstore IDs"""
+        # Precompute map links so responses don't build them per request
+        NaverMapUtils.annotate_documents(documents)
+        
+        # Create texts and metadatas for new documents
+        texts = [doc.page_content for doc in documents]
+        metadatas = [doc.metadata for doc in documents]
+        
+        # Add first so a failed embedding call leaves the old versions in place
+        new_ids = db.add_texts(texts=texts, metadatas=metadatas) if documents else []
+        if replace_ids:
+            db.delete(replace_ids)
+        return new_ids
+    
+    @staticmethod
+    def _document_key(document: Document, category: str) -> Tuple[str, str]:
+        metadata = document.metadata or {}
+        return category, str(metadata.get("contentid") or metadata.get("title") or document.page_content)
+    
+    def enqueue_documents(self, documents: List[Document], category: str) -> int:
+        """
+        Queue documents for a background write to the VectorDB
+        
+        Documents already waiting in the queue (same contentid or title) are skipped,
+        so concurrent requests for the same region enqueue each place only once.
+        Places already stored in the index are skipped by the writer (see write_batch).
+        
+        Returns:
+            Number of documents actually enqueued
+        """
+        with self._pending_lock:
+            fresh = []
+            for doc in documents:
+                key = self._document_key(doc, category)
+                if key not in self._pending_keys:
+                    self._pending_keys.add(key)
+                    fresh.append(doc)
+            if fresh:
+                self._write_queue.put((fresh, category))
+                if self._writer is None or not self._writer.is_alive():
+                    self._writer = threading.Thread(target=self._drain_write_queue, name="vectordb-writer", daemon=True)
+                    self._writer.start()
+        return len(fresh)
+    
+    def _drain_write_queue(self):
+        """Background worker that applies queued writes one at a time"""
+        while True:
+            documents, category = self._write_queue.get()
+            try:
+                self.add_documents_to_db(documents, category)
+            finally:
+                with self._pending_lock:
+                    for doc in documents:
+                        self._pending_keys.discard(self._document_key(doc, category))
+                self._write_queue.task_done()
+    
+    def flush(self):
+        """Block until all queued writes have been applied"""
+        self._write_queue.join()
+    
     def _save_updated_db(self, db: FAISS, db_name: str):
         """Save updated database to disk"""
         try:
             project_root = vm.get_project_root()
-            db_path = project_root / "data" / "db" / "faiss" / db_name
+            db_path = vm.get_db_path(db_name)
             
             # Create backup of existing DB
             backup_path = project_root / "data" / "db" / "backups" / f"{db_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -82,8 +197,8 @@ class VectorDBUpdater:
             # Save updated database
             db.save_local(str(db_path))
             
-            # Update cache
-            vm._db_cache[db_name] = db
+            # Update cache (records the new file version so load_db doesn't reload it)
+            vm.set_cached_db(db_name, db)
             
             logger.info(f"Updated database saved: {db_name}")
             
@@ -193,7 +308,9 @@ class VectorDBUpdater:
             
             # Additional information
             for key, value in item.items():
-                if key not in ['title', 'addr1', 'tel', 'pet_info', 'contentid'] and value:
+                # map_link/naver_place_id는 응답용 metadata이므로 임베딩 본문에서 제외
+                if key not in ['title', 'addr1', 'tel', 'pet_info', 'contentid',
+                               'map_link', 'naver_place_id'] and value:
                     content_parts.append(f"{key}: {value}")
             
             content = "\n".join(content_parts)
@@ -264,6 +381,19 @@ class VectorDBUpdater:
         return stats
 
 
+# Shared updater instance
+_updater: Optional[VectorDBUpdater] = None
+_updater_lock = threading.Lock()
+
+def get_db_updater() -> VectorDBUpdater:
+    """Get the process-wide VectorDBUpdater (one embedding handle, one write queue)"""
+    global _updater
+    with _updater_lock:
+        if _updater is None:
+            _updater = VectorDBUpdater()
+        return _updater
+
+
 # Convenience function
 def update_vectordb_with_external_data(api_data: List[Dict[str, Any]], 
                                      category: str, 
@@ -279,7 +409,7 @@ def update_vectordb_with_external_data(api_data: List[Dict[str, Any]],
     Returns:
         Success status
     """
-    updater = VectorDBUpdater()
+    updater = get_db_updater()
     documents = updater.create_documents_from_api_data(api_data, category, user_query)
     return updater.add_documents_to_db(documents, category)
 
@@ -1,18 +1,47 @@
 import os
 import json
 import math
-import requests
+import logging
+import functools
+import time
+import random
+import asyncio
+import threading
+import httpx
+import numpy as np
 import xml.etree.ElementTree as ET
+from collections import Counter
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
+import metrics
+
+logger = logging.getLogger(__name__)
+
 # 상위 디렉토리의 .env 파일을 명시적으로 로드
 dotenv_path = Path(__file__).resolve().parent.parent.parent / '.env'
 load_dotenv(dotenv_path=dotenv_path)
 open_data = os.getenv('OPEN_DATA')
-print(f"API Key loaded: {'Found' if open_data else 'Not Found'}")
+if not open_data:
+    logger.warning("OPEN_DATA API key not found; weather lookups will fail")
+
+# 원본 응답 로깅 샘플링 비율 (0~1, DEBUG 레벨에서만 적용)
+WEATHER_DEBUG_SAMPLE_RATE = float(os.getenv('WEATHER_DEBUG_SAMPLE_RATE', '0'))
+
+# 날씨 지표
+_api_latency = metrics.histogram('weather_api_latency_seconds', '기상청 API 호출 1회당 지연 시간')
+_api_results = metrics.counter('weather_api_results_total', '기상청 API 결과 코드별 응답 수')
+_cache_lookups = metrics.counter('weather_cache_lookups_total', '날씨 캐시 조회 결과(hit/miss/stale)')
+
+def _cache_hit_ratio() -> float:
+    hits = _cache_lookups.get(result='hit')
+    total = hits + _cache_lookups.get(result='miss')
+    return hits / total if total else 0.0
+
+metrics.gauge('weather_cache_hit_ratio', _cache_hit_ratio, '날씨 캐시 적중률')
 
 def get_current_time() -> Dict[str, str]:
     """
@@ -36,20 +65,50 @@ PTY_MAP = {
     '4': '소나기'
 }
 
-# 위경도 → nx, ny 변환 함수
-def latlon_to_grid(lat, lon):
-    """
-    Converts latitude/longitude to KMA grid coordinates (nx, ny).
-    """
-    RE = 6371.00877  # Earth radius (km)
-    GRID = 5.0       # Grid spacing (km)
-    SLAT1 = 30.0     # Projection latitude 1 (degree)
-    SLAT2 = 60.0     # Projection latitude 2 (degree)
-    OLON = 126.0     # Reference longitude (degree)
-    OLAT = 38.0      # Reference latitude (degree)
-    XO = 43          # Reference point X (GRID)
-    YO = 136         # Reference point Y (GRID)
-    DEGRAD = math.pi / 180.0
+# 지역 좌표 테이블 기본 경로
+DEFAULT_CITY_INFO_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'json', 'region_only_city_info.json'
+)
+
+# 초단기실황은 매시간 40분에 발표되므로 한 시간 동안만 캐시를 유지
+WEATHER_CACHE_TTL = 60 * 60
+
+# (nx, ny, base_date, base_time) → (만료 시각, 관측값)
+_weather_cache: Dict[Tuple[int, int, str, str], Tuple[float, Dict[str, Any]]] = {}
+_weather_cache_lock = threading.Lock()
+
+# 격자별 마지막 정상 관측값 (API 장애·지연 시 stale 응답용): (nx, ny) → (저장 시각, 관측값)
+# WEATHER_STALE_MAX_AGE보다 오래된 값은 "직전 발표 기준"으로 안내하지 않음
+WEATHER_STALE_MAX_AGE = float(os.getenv('WEATHER_STALE_MAX_AGE', str(3 * 60 * 60)))
+_last_observations: Dict[Tuple[int, int], Tuple[float, Dict[str, Any]]] = {}
+
+# 진행 중인 관측값 조회 (같은 격자·발표 시각 요청은 하나의 조회를 공유)
+_inflight_fetches: Dict[Tuple[int, int, str, str], "Future[Dict[str, Any]]"] = {}
+_inflight_lock = threading.Lock()
+
+# 프리페치 대상 선정을 위한 지역별 요청 횟수
+_region_request_counts: Counter = Counter()
+
+# 기상청 API 호출 설정
+WEATHER_API_URL = 'http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst'
+WEATHER_LATENCY_BUDGET = float(os.getenv('WEATHER_LATENCY_BUDGET', '1.5'))    # 채팅 응답 경로에서 기다리는 최대 시간(초)
+WEATHER_REQUEST_TIMEOUT = float(os.getenv('WEATHER_REQUEST_TIMEOUT', '1.0'))  # 시도 1회당 타임아웃(초)
+WEATHER_MAX_RETRIES = 2
+WEATHER_RETRY_BACKOFF = 0.1  # 재시도 기본 대기 시간(초), 지수 증가 + 지터
+
+# 기상청 격자 변환(Lambert Conformal Conic) 상수
+RE = 6371.00877  # Earth radius (km)
+GRID = 5.0       # Grid spacing (km)
+SLAT1 = 30.0     # Projection latitude 1 (degree)
+SLAT2 = 60.0     # Projection latitude 2 (degree)
+OLON = 126.0     # Reference longitude (degree)
+OLAT = 38.0      # Reference latitude (degree)
+XO = 43          # Reference point X (GRID)
+YO = 136         # Reference point Y (GRID)
+DEGRAD = math.pi / 180.0
+
+def _lambert_constants() -> Tuple[float, float, float, float, float]:
+    """투영 상수 (re, olon, sn, sf, ro)를 계산합니다. 모듈 로드 시 한 번만 호출됩니다."""
     re = RE / GRID
     slat1 = SLAT1 * DEGRAD
     slat2 = SLAT2 * DEGRAD
@@ -61,18 +120,93 @@ def latlon_to_grid(lat, lon):
     sf = math.pow(sf, sn) * math.cos(slat1) / sn
     ro = math.tan(math.pi * 0.25 + olat * 0.5)
     ro = re * sf / math.pow(ro, sn)
+    return re, olon, sn, sf, ro
+
+_RE, _OLON, _SN, _SF, _RO = _lambert_constants()
+
+# 위경도 → nx, ny 변환 함수
+def latlon_to_grid(lat, lon):
+    """
+    Converts latitude/longitude to KMA grid coordinates (nx, ny).
+    """
     ra = math.tan(math.pi * 0.25 + lat * DEGRAD * 0.5)
-    ra = re * sf / math.pow(ra, sn)
-    theta = lon * DEGRAD - olon
+    ra = _RE * _SF / math.pow(ra, _SN)
+    theta = lon * DEGRAD - _OLON
     if theta > math.pi:
         theta -= 2.0 * math.pi
     if theta < -math.pi:
         theta += 2.0 * math.pi
-    theta *= sn
+    theta *= _SN
     x = ra * math.sin(theta) + XO + 0.5
-    y = ro - ra * math.cos(theta) + YO + 0.5
+    y = _RO - ra * math.cos(theta) + YO + 0.5
     return int(x), int(y)
 
+def latlon_to_grid_batch(lats, lons) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized latlon_to_grid: converts arrays of latitude/longitude to KMA grid
+    coordinates in one pass. Returns (nx, ny) integer arrays.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    ra = np.tan(math.pi * 0.25 + lats * DEGRAD * 0.5)
+    ra = _RE * _SF / np.power(ra, _SN)
+    theta = lons * DEGRAD - _OLON
+    theta = np.where(theta > math.pi, theta - 2.0 * math.pi, theta)
+    theta = np.where(theta < -math.pi, theta + 2.0 * math.pi, theta)
+    theta *= _SN
+    x = ra * np.sin(theta) + XO + 0.5
+    y = _RO - ra * np.cos(theta) + YO + 0.5
+    return x.astype(np.int64), y.astype(np.int64)
+
+class RegionIndex:
+    """
+    region_only_city_info.json을 한 번만 읽어 만든 지역 인덱스.
+    정확히 일치하는 이름과 부분 문자열(접미사 포함)을 모두 dict로 색인해
+    지역명 → (지역 키, nx, ny) 조회를 상수 시간에 처리합니다.
+    """
+
+    def __init__(self, city_data: Dict[str, Dict[str, Any]]):
+        # 지역 키 → (nx, ny), 좌표가 잘못된 지역은 None
+        self.grids: Dict[str, Optional[Tuple[int, int]]] = {}
+        # 부분 문자열 → 해당 문자열을 포함하는 첫 번째 지역 키 (JSON 순서 기준)
+        self.partial: Dict[str, str] = {}
+
+        valid_keys, lats, lons = [], [], []
+        for region_key, info in city_data.items():
+            self.grids[region_key] = None
+            try:
+                lat, lon = float(info['lat']), float(info['lon'])
+            except (KeyError, ValueError, TypeError):
+                pass
+            else:
+                valid_keys.append(region_key)
+                lats.append(lat)
+                lons.append(lon)
+            for start in range(len(region_key)):
+                for end in range(start + 1, len(region_key) + 1):
+                    self.partial.setdefault(region_key[start:end], region_key)
+
+        # 전체 테이블의 격자 좌표를 한 번에 계산
+        nxs, nys = latlon_to_grid_batch(lats, lons)
+        for region_key, nx, ny in zip(valid_keys, nxs.tolist(), nys.tolist()):
+            self.grids[region_key] = (nx, ny)
+
+    def resolve(self, city: str) -> Optional[str]:
+        """정확히 일치하는 지역을 우선하고, 없으면 이름을 포함하는 첫 번째 지역 키를 반환합니다."""
+        if city in self.grids:
+            return city
+        return self.partial.get(city)
+
+    def __len__(self) -> int:
+        return len(self.grids)
+
+@functools.lru_cache(maxsize=None)
+def load_region_index(city_info_path: str = DEFAULT_CITY_INFO_PATH) -> RegionIndex:
+    """지역 좌표 테이블을 읽어 인덱스를 만들고 경로별로 캐시합니다."""
+    with open(city_info_path, 'r', encoding='utf-8') as f:
+        city_data = json.load(f)
+    return RegionIndex(city_data)
+
 # 기상청 API용 날짜/시간 계산
 def get_base_date_time():
     now = datetime.now()
@@ -95,89 +229,206 @@ def get_base_date_time():
     else:
         base_time = f"{hour:02d}00"
     
-    print(f"Using base_date: {base_date}, base_time: {base_time}")
+    logger.debug("Using base_date=%s base_time=%s", base_date, base_time)
     return base_date, base_time
 
-# 날씨 정보 조회 함수
-def get_weather(city, city_info_path=None):
+def _get_cached_observation(key: Tuple[int, int, str, str]) -> Optional[Dict[str, Any]]:
+    """캐시에서 만료되지 않은 관측값을 반환합니다."""
+    with _weather_cache_lock:
+        entry = _weather_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, observation = entry
+        if expires_at < time.monotonic():
+            del _weather_cache[key]
+            return None
+        return observation
+
+def _set_cached_observation(key: Tuple[int, int, str, str], observation: Dict[str, Any]) -> None:
+    """관측값을 캐시에 저장하고 만료된 항목을 정리합니다."""
+    now = time.monotonic()
+    with _weather_cache_lock:
+        for stale_key in [k for k, (expires_at, _) in _weather_cache.items() if expires_at < now]:
+            del _weather_cache[stale_key]
+        _weather_cache[key] = (now + WEATHER_CACHE_TTL, observation)
+        _last_observations[key[:2]] = (now, observation)
+
+def _get_last_observation(grid: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+    """WEATHER_STALE_MAX_AGE 안에 저장된 격자의 마지막 정상 관측값을 반환합니다."""
+    with _weather_cache_lock:
+        entry = _last_observations.get(grid)
+        if entry is None:
+            return None
+        stored_at, observation = entry
+        if time.monotonic() - stored_at > WEATHER_STALE_MAX_AGE:
+            del _last_observations[grid]
+            return None
+        return observation
+
+def clear_weather_cache() -> None:
+    """날씨 캐시를 비웁니다."""
+    with _weather_cache_lock:
+        _weather_cache.clear()
+        _last_observations.clear()
+
+class CircuitBreaker:
     """
-    Returns weather info for a given region name (e.g. '서울', '부산', '수원', '기장').
-    Finds the first key in city_info JSON that contains the input string if exact match is not found.
-    Returns dict: {city, temperature, humidity, precipitation_type, wind_speed}
-    If an error occurs, returns dict with 'error' key and message.
+    연속 실패가 failure_threshold번 누적되면 reset_timeout 동안 호출을 차단하고,
+    이후 한 번의 시험 호출(half-open)이 성공하면 다시 닫힙니다.
+    시험 호출이 진행 중인 동안 다른 호출은 계속 차단되고, 시험 호출이 실패하면 다시 열립니다.
     """
-    # Use absolute path if not provided
-    if city_info_path is None:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        city_info_path = os.path.join(current_dir, '..', 'data', 'json', 'region_only_city_info.json')
-    
-    try:
-        with open(city_info_path, 'r', encoding='utf-8') as f:
-            city_data = json.load(f)
-    except FileNotFoundError:
-        return {'error': f"city info file not found: {city_info_path}"}
-    except json.JSONDecodeError:
-        return {'error': f"city info file is not valid JSON: {city_info_path}"}
 
-    region_key = city if city in city_data else next((k for k in city_data if city in k), None)
-    if not region_key:
-        return {'error': f"'{city}'에 해당하는 지역이 region_only_city_info.json에 없습니다."}
-    try:
-        lat = float(city_data[region_key]['lat'])
-        lon = float(city_data[region_key]['lon'])
-    except (KeyError, ValueError, TypeError):
-        return {'error': f"Invalid lat/lon for region: {region_key}"}
-    nx, ny = latlon_to_grid(lat, lon)
-    base_date, base_time = get_base_date_time()
-    url = 'http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst'
-    params = {
-        'serviceKey': open_data,
-        'pageNo': '1',
-        'numOfRows': '1000',
-        'dataType': 'XML',
-        'base_date': base_date,
-        'base_time': base_time,
-        'nx': str(nx),
-        'ny': str(ny)
-    }
-    try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        print(f"API Response Status: {response.status_code}")
-        print(f"API Response Content: {response.text[:500]}...")  # 응답 내용 일부 출력
-    except requests.RequestException as e:
-        return {'error': f"Weather API request failed: {e}"}
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        # half-open 시험 호출을 허용한 시각 (진행 중인 시험 호출이 없으면 None)
+        self._half_open_trial_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < self.reset_timeout:
+                return False
+            # 결과를 기록하지 못하고 끝난 시험 호출은 reset_timeout 뒤에 새 시험 호출로 대체
+            if self._half_open_trial_at is not None and now - self._half_open_trial_at < self.reset_timeout:
+                return False
+            self._half_open_trial_at = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._half_open_trial_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._half_open_trial_at is not None or self._failures >= self.failure_threshold:
+                # 시험 호출 실패는 임계값과 관계없이 바로 다시 열림
+                self._opened_at = time.monotonic()
+                self._half_open_trial_at = None
+
+class WeatherClient:
+    """
+    기상청 API용 공유 비동기 HTTP 클라이언트.
+    전용 이벤트 루프 스레드에서 하나의 httpx.AsyncClient(HTTP/1.1 keep-alive 커넥션 풀)를
+    재사용하며, 동기 호출측은 run()으로 코루틴을 제출하고 지연 예산만큼만 기다립니다.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.breaker = CircuitBreaker()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="weather-client", daemon=True)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # 이벤트 루프 스레드 안에서만 호출되므로 별도 잠금이 필요 없음
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=False,
+                timeout=httpx.Timeout(WEATHER_REQUEST_TIMEOUT, connect=min(0.5, WEATHER_REQUEST_TIMEOUT)),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0),
+            )
+        return self._client
+
+    def submit(self, coro) -> Future:
+        """코루틴을 클라이언트 루프에 제출합니다. 호출측이 기다리지 않아도 끝까지 실행됩니다."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+
+    def run(self, coro, timeout: float):
+        """
+        코루틴을 클라이언트 루프에서 실행하고 최대 timeout초까지 결과를 기다립니다.
+        시간을 넘기면 호출측만 기다림을 멈추고 코루틴은 백그라운드에서 계속 실행됩니다.
+        """
+        return self.submit(coro).result(timeout=timeout)
+
+    async def get(self, url: str, params: Dict[str, str]) -> httpx.Response:
+        """지터가 있는 지수 백오프로 재시도하며 GET 요청을 보냅니다."""
+        if not self.breaker.allow_request():
+            _api_results.inc(code='circuit_open')
+            raise httpx.HTTPError("Weather API circuit breaker is open")
+        for attempt in range(WEATHER_MAX_RETRIES + 1):
+            started = time.perf_counter()
+            try:
+                response = await self._get_client().get(url, params=params)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                _api_latency.observe(time.perf_counter() - started)
+                _api_results.inc(code='timeout' if isinstance(e, httpx.TimeoutException) else 'http_error')
+                self.breaker.record_failure()
+                if attempt == WEATHER_MAX_RETRIES or not self.breaker.allow_request():
+                    raise
+                await asyncio.sleep(WEATHER_RETRY_BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5))
+            else:
+                _api_latency.observe(time.perf_counter() - started)
+                self.breaker.record_success()
+                return response
+
+    def close(self) -> None:
+        """커넥션 풀과 이벤트 루프를 정리합니다."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), loop).result(timeout=5)
+            self._client = None
+        loop.call_soon_threadsafe(loop.stop)
+
+_weather_client = WeatherClient()
+
+def close_weather_client() -> None:
+    """공유 날씨 API 클라이언트를 닫습니다."""
+    _weather_client.close()
+
+def _parse_observation(content: bytes) -> Dict[str, Any]:
+    """
+    초단기실황 XML 응답을 관측값으로 변환합니다.
+    Returns dict: {temperature, humidity, precipitation_type, wind_speed}
+    If an error occurs, returns dict with 'error' key and message.
+    """
     try:
-        root = ET.fromstring(response.content)
+        root = ET.fromstring(content)
         
         # 응답 코드 확인
         result_code = root.find('.//resultCode').text
         result_msg = root.find('.//resultMsg').text
         
-        print(f"Result Code: {result_code}, Message: {result_msg}")
+        _api_results.inc(code=result_code)
         
         # NO_DATA 응답 처리
         if result_code == '03' and result_msg == 'NO_DATA':
             return {
                 'error': "날씨 데이터가 없습니다. 기상청 API가 데이터를 제공하지 않고 있습니다.",
-                'city': region_key,
                 'no_data': True
             }
         
         # 다른 오류 처리
         if result_code != '00':
+            logger.warning("Weather API error: %s (code: %s)", result_msg, result_code)
             return {'error': f"Weather API error: {result_msg} (code: {result_code})"}
         
         items = list(root.iter('item'))
-        print(f"Found {len(items)} items in response")
-        
         if len(items) == 0:
-            # 응답 구조 확인
-            print(f"Response structure: {ET.tostring(root, encoding='utf8').decode('utf8')[:500]}...")
             return {'error': "No items found in API response"}
             
         weather = {item.find('category').text: item.find('obsrValue').text for item in items}
-        print(f"Extracted weather data: {weather}")
     except ET.ParseError:
         return {'error': "Weather API response is not valid XML."}
     except Exception as e:
@@ -185,10 +436,158 @@ def get_weather(city, city_info_path=None):
     if not weather:
         return {'error': "No weather data found for the given region."}
     return {
-        'city': region_key,
         'temperature': weather.get('T1H'),
         'humidity': weather.get('REH'),
         'precipitation_type': PTY_MAP.get(weather.get('PTY', '0'), '알수없음'),
         'wind_speed': weather.get('WSD')
     }
+
+async def _fetch_observation_async(nx: int, ny: int, base_date: str, base_time: str) -> Dict[str, Any]:
+    """기상청 초단기실황 API를 호출해 격자 하나의 관측값을 가져옵니다."""
+    params = {
+        'serviceKey': open_data,
+        'pageNo': '1',
+        'numOfRows': '1000',
+        'dataType': 'XML',
+        'base_date': base_date,
+        'base_time': base_time,
+        'nx': str(nx),
+        'ny': str(ny)
+    }
+    try:
+        response = await _weather_client.get(WEATHER_API_URL, params)
+    except httpx.HTTPError as e:
+        logger.warning("Weather API request failed: %s", e)
+        return {'error': f"Weather API request failed: {e}"}
+    if WEATHER_DEBUG_SAMPLE_RATE > 0 and logger.isEnabledFor(logging.DEBUG) \
+            and random.random() < WEATHER_DEBUG_SAMPLE_RATE:
+        logger.debug("Weather API raw response (nx=%s, ny=%s): %s", nx, ny, response.text[:500])
+    return _parse_observation(response.content)
+
+async def _fetch_and_cache_observation_async(nx: int, ny: int, base_date: str, base_time: str) -> Dict[str, Any]:
+    """
+    관측값을 조회하고 정상 응답이면 직접 캐시에 저장합니다.
+    호출측이 지연 예산을 넘겨 기다림을 멈춘 뒤에 도착한 응답도 다음 요청에서 쓰이도록 합니다.
+    """
+    observation = await _fetch_observation_async(nx, ny, base_date, base_time)
+    if 'error' not in observation:
+        _set_cached_observation((nx, ny, base_date, base_time), observation)
+    return observation
+
+def _discard_inflight(key: Tuple[int, int, str, str], future: Future) -> None:
+    with _inflight_lock:
+        if _inflight_fetches.get(key) is future:
+            del _inflight_fetches[key]
+
+def _fetch_observation(nx: int, ny: int, base_date: str, base_time: str,
+                       budget: float = WEATHER_LATENCY_BUDGET) -> Dict[str, Any]:
+    """
+    지연 예산(budget초) 안에서만 API 응답을 기다리는 동기 래퍼.
+    같은 격자·발표 시각의 조회가 이미 진행 중이면 새로 요청하지 않고 그 결과를 기다립니다.
+    """
+    key = (nx, ny, base_date, base_time)
+    with _inflight_lock:
+        future = _inflight_fetches.get(key)
+        started = future is None
+        if started:
+            future = _weather_client.submit(_fetch_and_cache_observation_async(*key))
+            _inflight_fetches[key] = future
+    if started:
+        # 이미 끝났다면 콜백이 바로 실행되므로 잠금 밖에서 등록
+        future.add_done_callback(lambda done: _discard_inflight(key, done))
+    try:
+        return future.result(timeout=budget)
+    except FutureTimeoutError:
+        _api_results.inc(code='budget_exceeded')
+        return {'error': f"Weather API did not respond within {budget}s"}
+
+# 날씨 정보 조회 함수
+def get_weather(city, city_info_path=None, budget: float = WEATHER_LATENCY_BUDGET):
+    """
+    Returns weather info for a given region name (e.g. '서울', '부산', '수원', '기장').
+    Finds the first key in city_info JSON that contains the input string if exact match is not found.
+    The city table is loaded and indexed once per path (see load_region_index).
+    Observations are cached per (nx, ny, base_date, base_time), so regions sharing a grid cell
+    and repeated questions within the same publish hour do not call the API again.
+    If the API fails or exceeds the latency budget, the last good observation for the grid cell
+    (at most WEATHER_STALE_MAX_AGE seconds old) is returned with 'stale': True instead of an error.
+    A response that arrives after the budget is still cached for the next request.
+    Returns dict: {city, temperature, humidity, precipitation_type, wind_speed}
+    If an error occurs, returns dict with 'error' key and message.
+    """
+    if city_info_path is None:
+        city_info_path = DEFAULT_CITY_INFO_PATH
     
+    try:
+        region_index = load_region_index(city_info_path)
+    except FileNotFoundError:
+        return {'error': f"city info file not found: {city_info_path}"}
+    except json.JSONDecodeError:
+        return {'error': f"city info file is not valid JSON: {city_info_path}"}
+
+    region_key = region_index.resolve(city)
+    if not region_key:
+        return {'error': f"'{city}'에 해당하는 지역이 region_only_city_info.json에 없습니다."}
+    grid = region_index.grids[region_key]
+    if grid is None:
+        return {'error': f"Invalid lat/lon for region: {region_key}"}
+    nx, ny = grid
+    base_date, base_time = get_base_date_time()
+    _region_request_counts[region_key] += 1
+
+    cache_key = (nx, ny, base_date, base_time)
+    observation = _get_cached_observation(cache_key)
+    if observation is None:
+        _cache_lookups.inc(result='miss')
+        # 정상 응답은 조회 코루틴이 캐시에 저장함 (예산을 넘겨 늦게 도착한 경우 포함)
+        observation = _fetch_observation(nx, ny, base_date, base_time, budget=budget)
+        if 'error' in observation:
+            stale = _get_last_observation((nx, ny))
+            if stale is not None:
+                _cache_lookups.inc(result='stale')
+                return {'city': region_key, **stale, 'stale': True}
+            return {**observation, 'city': region_key} if observation.get('no_data') else observation
+    else:
+        _cache_lookups.inc(result='hit')
+    return {'city': region_key, **observation}
+
+def prefetch_popular_weather(top_n: int = 10) -> List[str]:
+    """
+    가장 많이 요청된 지역 top_n개의 날씨를 미리 조회해 캐시를 채웁니다.
+    Returns the list of region names that were prefetched.
+    """
+    regions = [region for region, _ in _region_request_counts.most_common(top_n)]
+    # 백그라운드 작업이므로 재시도를 모두 기다릴 수 있도록 예산을 넉넉히 설정
+    budget = WEATHER_REQUEST_TIMEOUT * (WEATHER_MAX_RETRIES + 1) + 1.0
+    for region in regions:
+        get_weather(region, budget=budget)
+        # 프리페치 호출이 요청 횟수에 반영되지 않도록 되돌림
+        _region_request_counts[region] -= 1
+    return regions
+
+_prefetch_thread: Optional[threading.Thread] = None
+
+def _seconds_until_next_publish(now: Optional[datetime] = None) -> float:
+    """다음 발표(매시 40분) 직후인 매시 41분까지 남은 시간(초)"""
+    now = now or datetime.now()
+    target = now.replace(minute=41, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(hours=1)
+    return (target - now).total_seconds()
+
+def start_weather_prefetcher(top_n: int = 10) -> None:
+    """매시 발표 직후 인기 지역 날씨를 미리 가져오는 백그라운드 스레드를 시작합니다."""
+    global _prefetch_thread
+    if _prefetch_thread is not None and _prefetch_thread.is_alive():
+        return
+
+    def _run():
+        while True:
+            time.sleep(_seconds_until_next_publish())
+            try:
+                prefetch_popular_weather(top_n)
+            except Exception as e:
+                logger.warning("Weather prefetch failed: %s", e)
+
+    _prefetch_thread = threading.Thread(target=_run, name="weather-prefetch", daemon=True)
+    _prefetch_thread.start()
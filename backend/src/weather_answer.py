@@ -0,0 +1,122 @@
+"""
+날씨만 묻는 질의에 대한 로컬 응답 경로.
+
+"부산 날씨 어때?"처럼 날씨 외 다른 요청이 없는 질의는 규칙으로 분류하고, 지역을 찾아
+(캐시된) 관측값을 받아 마크다운 템플릿으로 바로 답합니다. 검색과 LLM 호출이 없습니다.
+"""
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import metrics
+from query_rules import classify_query, extract_weather_region
+from weather import get_weather, get_current_time, load_region_index
+
+logger = logging.getLogger(__name__)
+
+# 반려동물 외출 유의사항 기준값
+HOT_TEMPERATURE = 28.0
+WARM_TEMPERATURE = 23.0
+COLD_TEMPERATURE = 5.0
+STRONG_WIND = 9.0
+HIGH_HUMIDITY = 80.0
+
+_answers = metrics.counter('weather_fast_path_total', '날씨 전용 로컬 응답 경로 처리 결과')
+_latency = metrics.histogram('weather_fast_path_latency_seconds', '날씨 전용 로컬 응답 지연 시간')
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _weather_tips(weather_data: Dict[str, Any]) -> List[str]:
+    """관측값에 맞는 한 줄 코멘트와 외출 유의사항"""
+    temperature = _to_float(weather_data.get('temperature'))
+    humidity = _to_float(weather_data.get('humidity'))
+    wind_speed = _to_float(weather_data.get('wind_speed'))
+    precipitation = weather_data.get('precipitation_type') or '맑음'
+
+    tips = []
+    if precipitation in ('비', '비/눈', '소나기'):
+        comment = "비 소식이 있어요. 외출 시간은 짧게 잡는 게 좋겠어요. ☔"
+        tips += ["반려동물용 **우비**와 닦아줄 **수건**을 챙겨주세요.",
+                 "돌아와서는 발바닥과 털을 잘 말려 **피부병**을 예방해 주세요."]
+    elif precipitation == '눈':
+        comment = "눈이 내리고 있어요. 미끄러운 길을 조심하세요! ❄️"
+        tips += ["**염화칼슘**이 발바닥에 닿지 않도록 산책 후 꼭 씻겨주세요.",
+                 "체온 유지를 위해 **옷**을 입혀주세요."]
+    elif temperature is not None and temperature >= HOT_TEMPERATURE:
+        comment = "꽤 더운 날씨예요. 한낮 산책은 피하는 게 좋아요. 🥵"
+        tips += ["**뜨거운 아스팔트**로부터 발바닥을 보호해 주세요. 이른 아침이나 저녁 산책을 추천해요.",
+                 "**열사병** 예방을 위해 그늘에서 자주 쉬게 해주세요."]
+    elif temperature is not None and temperature <= COLD_TEMPERATURE:
+        comment = "쌀쌀한 날씨예요. 따뜻하게 챙겨 입고 나가세요! 🧣"
+        tips += ["소형견·단모종은 **옷**을 입혀 체온을 지켜주세요.",
+                 "산책 시간은 평소보다 **짧게** 조절해 주세요."]
+    elif temperature is not None and temperature >= WARM_TEMPERATURE:
+        comment = "포근하고 활동하기 좋은 날씨예요! 🐶💕"
+        tips.append("햇볕이 강할 수 있으니 **그늘에서 쉬는 시간**을 자주 주세요.")
+    else:
+        comment = "산책하기 좋은 날씨네요! 반려동물과 외출하시기 좋은 날이에요. 🐶💕"
+
+    if wind_speed is not None and wind_speed >= STRONG_WIND:
+        tips.append("바람이 강해요. **리드줄**을 단단히 잡고 날리는 물건에 주의해 주세요.")
+    if humidity is not None and humidity >= HIGH_HUMIDITY and precipitation == '맑음':
+        tips.append("습도가 높아요. 헥헥거림이 심해지면 바로 **휴식**을 주세요.")
+    tips.append("**수분 보충**을 위해 물을 꼭 챙겨주세요.")
+    return [comment] + tips
+
+
+def render_weather_answer(region: str, weather_data: Dict[str, Any], current_time: Dict[str, str]) -> str:
+    """get_weather 결과를 마크다운 답변으로 만듭니다."""
+    if "error" in weather_data:
+        return f"""# {region} 날씨 정보
+
+## 현재 시간: {current_time['full_datetime']}
+죄송합니다. 지금은 **{region}**의 날씨 정보를 가져오지 못했어요. 잠시 후 다시 물어봐 주세요.
+
+## 🐾 외출 시 주의사항
+* 충분한 **물**을 준비해 수시로 수분을 공급해 주세요.
+* 비가 올 수 있으니 반려동물용 **우비나 수건**을 챙겨주세요.
+* 외출 전후에 반려동물의 **컨디션**을 확인해 주세요."""
+
+    city = weather_data.get('city', region)
+    comment, *tips = _weather_tips(weather_data)
+    answer = f"""# {city} 날씨 정보
+
+## 🌤️ 현재 {city} 날씨 ({current_time['full_datetime']})
+* 🌡️ **기온**: {weather_data['temperature']}°C
+* 💧 **습도**: {weather_data['humidity']}%
+* 🌬️ **바람**: {weather_data['wind_speed']} m/s
+* 🌤️ **날씨 상태**: {weather_data['precipitation_type']}
+"""
+    if weather_data.get('stale'):
+        answer += "* *기상청 응답이 지연되어 직전 발표 기준 정보를 안내합니다.*\n"
+    answer += f"\n{comment}\n\n## 🐾 외출 시 주의사항\n"
+    answer += "\n".join(f"* {tip}" for tip in tips)
+    return answer
+
+
+def answer_weather_query(query: str) -> Optional[str]:
+    """
+    날씨만 묻는 질의면 로컬 템플릿 답변을, 아니면 None을 반환합니다.
+    지역을 찾지 못하면 None을 반환해 일반 경로(LLM)로 넘깁니다.
+    """
+    started = time.perf_counter()
+    if classify_query(query) != ["날씨"]:
+        return None
+
+    region = extract_weather_region(query)
+    if not region or load_region_index().resolve(region) is None:
+        _answers.inc(result="unknown_region")
+        return None
+
+    weather_data = get_weather(region)
+    answer = render_weather_answer(region, weather_data, get_current_time())
+    _answers.inc(result="error" if "error" in weather_data else "answered")
+    _latency.observe(time.perf_counter() - started)
+    logger.info(f"Weather fast path for '{region}' in {(time.perf_counter() - started) * 1e3:.1f} ms")
+    return answer
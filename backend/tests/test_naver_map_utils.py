@@ -0,0 +1,45 @@
+import json
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from naver_map_utils import NaverMapUtils
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data' / 'json'
+
+
+def _document(metadata):
+    return SimpleNamespace(page_content="", metadata=metadata)
+
+
+def test_annotate_local_lodging_documents():
+    """faiss_pet_kure 문서는 장소 이름을 facility_name에 저장함"""
+    with open(DATA_DIR / 'pet_lodging_places_202412.json', 'r', encoding='utf-8') as f:
+        records = json.load(f)[:3]
+    documents = [_document(dict(record["metadata"])) for record in records]
+
+    assert NaverMapUtils.annotate_documents(documents) == len(documents)
+    for record, doc in zip(records, documents):
+        name = record["metadata"]["facility_name"]
+        assert doc.metadata["map_link"] == NaverMapUtils.get_map_link(name)
+    # 이미 채워진 문서는 다시 계산하지 않음
+    assert NaverMapUtils.annotate_documents(documents) == 0
+
+
+def test_annotate_tour_api_documents():
+    doc = _document({"title": "속초해수욕장", "addr1": "강원특별자치도 속초시", "contentid": "1"})
+
+    assert NaverMapUtils.annotate_documents([doc]) == 1
+    assert doc.metadata["naver_place_id"] == "13994080"
+    assert doc.metadata["map_link"] == "https://map.naver.com/p/entry/place/13994080"
+
+
+def test_annotate_skips_documents_without_place_name():
+    """faiss_regular_kure의 규정 문서에는 장소 이름이 없음"""
+    doc = _document({"source": "대한민국 구석구석", "image_file": "part01_01.png", "part_id": "part01"})
+
+    assert NaverMapUtils.annotate_documents([doc]) == 0
+    assert "map_link" not in doc.metadata